@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+
+GUI_MODULES: tuple[str, ...] = ('PyQt6', 'qcustomwindow', 'qcustomwidgets', 'PIL')
+
+# module: (cumulative import budget in ms, top-level packages it must not load)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    'qissuereporter': (30, GUI_MODULES + ('httpx', 'pydantic')),
+    'qissuereporter.models': (400, GUI_MODULES + ('httpx',)),
+    'qissuereporter.parsing': (450, GUI_MODULES + ('httpx',)),
+    'qissuereporter.api': (200, GUI_MODULES + ('httpx',)),
+    'qissuereporter.outbox': (800, GUI_MODULES),
+    'qissuereporter.headless': (800, GUI_MODULES),
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=False)
+    if result.returncode:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(repeat: int = 5) -> int:
+    failures: int = 0
+    for module, (budget, forbidden) in BUDGETS.items():
+        try:
+            runs: list[dict[str, int]] = [import_times(module) for _ in range(repeat)]
+        except ImportError as err:
+            failures += 1
+            print(f'{module:<28} failed: {err}')
+            continue
+        best: float = min(run[module] for run in runs) / 1000
+        loaded: list[str] = sorted({name.split('.')[0] for name in runs[0]} & set(forbidden))
+        status: str = 'ok'
+        if best > budget:
+            status = f'over budget ({budget:.0f} ms)'
+        if loaded:
+            status = f'imports {", ".join(loaded)}'
+        if status != 'ok':
+            failures += 1
+        print(f'{module:<28} {best:8.1f} ms  {status}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
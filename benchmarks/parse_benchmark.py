@@ -0,0 +1,76 @@
+import base64
+import gc
+import os
+from datetime import UTC, datetime
+from time import perf_counter
+from pydantic import ValidationError
+from qissuereporter.models import BugReportModel, ContentJSON, IssueContentModel
+from qissuereporter.parsing import image_str, parse_issues
+
+
+def make_issues(amount: int, images: int = 2, image_size: int = 30_000) -> list[dict]:
+    now: str = datetime.now(UTC).isoformat()
+    image_b64: str = base64.b64encode(os.urandom(image_size)).decode()
+    report = BugReportModel(report_type='Bug Report', title='', version='0.1.0',
+                            details='Steps to reproduce\n\n1. open\n2. crash',
+                            images=[image_b64] * images, images_size=0,
+                            client_version='0.1.0', username='user')
+    body: str = report.query()['body']
+    return [{'number': i, 'title': f'Issue {i}', 'state': 'open' if i % 2 else 'closed',
+             'state_reason': None, 'type': {'name': 'Bug'}, 'created_at': now,
+             'closed_at': None if i % 2 else now, 'html_url': f'https://example.com/{i}',
+             'body': body} for i in range(amount)]
+
+
+def legacy_parse(issue: dict) -> IssueContentModel:
+    try:
+        content_json: ContentJSON = ContentJSON.model_validate_json(issue['body'])
+        images = [image[len(image_str):-17] for image in content_json.images]
+        content = content_json.content
+        username = content_json.username
+        version = content_json.version
+    except ValidationError:
+        images = []
+        content = issue['body']
+        username = ''
+        version = ''
+    issue_type = issue['type']
+    return IssueContentModel(images=images, number=issue['number'],
+                             url=issue['html_url'],
+                             is_opened=(issue['state'] == 'open'),
+                             title=issue['title'], version=version,
+                             username=username, content=content,
+                             created_at=issue['created_at'],
+                             issue_type=issue_type['name'] if issue_type else 'Bug',
+                             closed_at=issue['closed_at'],
+                             close_reason=issue['state_reason'])
+
+
+def measure(parse, issues: list[dict], repeat: int = 15) -> float:
+    best: float = float('inf')
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start: float = perf_counter()
+            parse(issues)
+            best = min(best, perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main(amount: int = 2000):
+    for images in (0, 2):
+        issues: list[dict] = make_issues(amount, images)
+        legacy: float = measure(lambda issues: [legacy_parse(issue) for issue in issues],
+                                issues)
+        batch: float = measure(parse_issues, issues)
+        print(f'{amount} issues, {images} images each')
+        print(f'  per-issue models: {legacy * 1000:.1f} ms')
+        print(f'  batch parse:      {batch * 1000:.1f} ms')
+        print(f'  speedup:          {legacy / batch:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter
+from qissuereporter.api import ApiSession, get_issues
+
+
+PAYLOAD: bytes = json.dumps([{'number': i, 'title': f'Issue {i}'}
+                             for i in range(50)]).encode()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def refresh_loop(url: str, refreshes: int,
+                       session: ApiSession | None) -> float:
+    start: float = perf_counter()
+    for _ in range(refreshes):
+        await get_issues(url, '', session=session)
+    return (perf_counter() - start) / refreshes * 1000
+
+
+async def main(refreshes: int = 200):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url: str = f'http://127.0.0.1:{server.server_port}/issues'
+    await refresh_loop(url, 10, None)
+    per_call: float = await refresh_loop(url, refreshes, None)
+    session = ApiSession()
+    await refresh_loop(url, 10, session)
+    pooled: float = await refresh_loop(url, refreshes, session)
+    await session.aclose()
+    server.shutdown()
+    print(f'client per refresh: {per_call:.3f} ms/refresh')
+    print(f'pooled session:     {pooled:.3f} ms/refresh')
+    print(f'speedup:            {per_call / pooled:.2f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
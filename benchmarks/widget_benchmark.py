@@ -0,0 +1,66 @@
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6 import QtWidgets
+from PyQt6.uic.load_ui import loadUi, loadUiType
+from qissuereporter.models import IssueContentModel
+
+
+UI_FILES: list[Path] = [
+    Path(__file__).parents[1] / 'qissuereporter' / 'viewer' / 'viewer_content.ui',
+    Path(__file__).parents[1] / 'qissuereporter' / 'viewer' / 'viewer.ui',
+    Path(__file__).parents[1] / 'qissuereporter' / 'creator' / 'bug_report.ui',
+]
+
+
+def measure(build, amount: int) -> float:
+    widgets: list[QtWidgets.QWidget] = []
+    start: float = perf_counter()
+    for _ in range(amount):
+        widgets.append(build())
+    elapsed: float = perf_counter() - start
+    for widget in widgets:
+        widget.deleteLater()
+    return elapsed / amount * 1000
+
+
+def runtime_load(path: Path) -> QtWidgets.QWidget:
+    widget = QtWidgets.QWidget()
+    loadUi(path, widget)
+    return widget
+
+
+def compiled_load(form: type) -> QtWidgets.QWidget:
+    widget = QtWidgets.QWidget()
+    form().setupUi(widget)
+    return widget
+
+
+def main(amount: int = 200):
+    app = QtWidgets.QApplication([])
+    for path in UI_FILES:
+        form, _ = loadUiType(str(path))
+        runtime: float = measure(lambda: runtime_load(path), amount)
+        compiled: float = measure(lambda: compiled_load(form), amount)
+        print(f'{path.name:<20} loadUi {runtime:6.2f} ms   setupUi {compiled:6.2f} ms   '
+              f'{runtime / compiled:5.1f}x')
+    from qissuereporter.viewer.viewer_content import ContentWidget
+
+    class RuntimeContentWidget(ContentWidget):
+        def setupUi(self, widget: QtWidgets.QWidget) -> None:
+            loadUi(UI_FILES[0], widget)
+
+    issue = IssueContentModel(title='Issue', url='https://example.com/1', number=1,
+                              is_opened=True, content='details',
+                              created_at=datetime.now(UTC), issue_type='Bug')
+    runtime = measure(lambda: RuntimeContentWidget(issue, folded=True), amount)
+    compiled = measure(lambda: ContentWidget(issue, folded=True), amount)
+    print(f'ContentWidget (folded) loadUi {runtime:6.2f} ms   setupUi {compiled:6.2f} ms   '
+          f'{runtime / compiled:5.1f}x per issue')
+    app.processEvents()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,29 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 __version__ = '0.1.0'
 
-from .creator.main_window import ReporterWindow
-from .viewer.main_window import ViewerWindow
+if TYPE_CHECKING:
+    from .creator.main_window import ReporterWindow
+    from .viewer.main_window import ViewerWindow
+
+
+_lazy_attributes: dict[str, str] = {
+    'ReporterWindow': '.creator.main_window',
+    'ViewerWindow': '.viewer.main_window',
+}
+
+__all__ = ['ReporterWindow', 'ViewerWindow', '__version__']
+
+
+def __getattr__(name: str) -> Any:
+    module: str | None = _lazy_attributes.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value: Any = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_lazy_attributes))
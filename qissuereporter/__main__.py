@@ -1,9 +1,9 @@
-
+import argparse
 import asyncio
+import json
+import os
 import signal
-from PyQt6 import QtWidgets
-from qissuereporter.creator.main_window import ReporterWindow
-from qissuereporter.viewer.main_window import ViewerWindow
+import sys
 from qissuereporter import __version__
 
 
@@ -11,9 +11,50 @@ token = ''
 url = ''
 
 
-if __name__ == '__main__':
+def submit(args: argparse.Namespace) -> int:
+    from qissuereporter.headless import submit_files
+    defaults: dict[str, str] = {'report_type': args.report_type,
+                                'version': args.version,
+                                'username': args.username}
+    results = asyncio.run(submit_files(args.files or ['-'], args.url, args.token,
+                                       args.concurrency, args.quality, defaults))
+    for result in results:
+        if args.json:
+            print(json.dumps(result._asdict()))
+        else:
+            state: str = result.url if result.ok else f'FAILED {result.error}'
+            print(f'{result.source}: {state}')
+    return 0 if all(result.ok for result in results) else 1
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='qissuereporter')
+    commands = parser.add_subparsers(dest='command')
+    submit_parser = commands.add_parser('submit', help='file reports without the GUI')
+    submit_parser.add_argument('files', nargs='*',
+                               help='JSON or markdown report files, "-" for stdin')
+    submit_parser.add_argument('--url', default=url)
+    submit_parser.add_argument('--token', default=os.environ.get('QISSUEREPORTER_TOKEN', token))
+    submit_parser.add_argument('--concurrency', type=int, default=4)
+    submit_parser.add_argument('--quality', type=int, default=70)
+    submit_parser.add_argument('--report-type', default='Bug Report')
+    submit_parser.add_argument('--version', default=__version__)
+    submit_parser.add_argument('--username', default='')
+    submit_parser.add_argument('--json', action='store_true',
+                               help='print one JSON result per line')
+    return parser.parse_args(argv)
+
+
+def main():
+    from PyQt6 import QtWidgets
     from qasync import QEventLoop
     from qcustomwidgets import dark, stylesheet
+    from qissuereporter.creator.main_window import ReporterWindow
+    from qissuereporter.viewer.main_window import ViewerWindow
+    from qissuereporter.api import ApiSession
+    from qissuereporter.image_view.decoder import decoder
+    from qissuereporter.image_view.encoder import encoder
+    from qissuereporter.watchdog import StallWatchdog
     app = QtWidgets.QApplication([])
     app.setStyleSheet(stylesheet)
     dark()
@@ -21,10 +62,28 @@ if __name__ == '__main__':
     asyncio.set_event_loop(event_loop)
     app_close_event = asyncio.Event()
     app.aboutToQuit.connect(app_close_event.set)
-    viewer: ViewerWindow = ViewerWindow(url, token)
-    reporter: ReporterWindow = ReporterWindow(__version__, url, token)
+    session = ApiSession()
+    watchdog = StallWatchdog()
+    event_loop.call_soon(watchdog.start, event_loop)
+    viewer: ViewerWindow = ViewerWindow(url, token, session)
+    reporter: ReporterWindow = ReporterWindow(__version__, url, token,
+                                              session=session, watchdog=watchdog)
+    viewer.issues_loaded.connect(reporter.widget.add_known_issues)
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     viewer.show()
     reporter.show()
     with event_loop:
         event_loop.run_until_complete(app_close_event.wait())
+        event_loop.run_until_complete(reporter.outbox.stop())
+        event_loop.run_until_complete(viewer.poller.stop())
+        event_loop.run_until_complete(session.aclose())
+        watchdog.stop()
+    decoder.shutdown()
+    encoder.shutdown()
+
+
+if __name__ == '__main__':
+    arguments: argparse.Namespace = parse_args(sys.argv[1:])
+    if arguments.command == 'submit':
+        sys.exit(submit(arguments))
+    main()
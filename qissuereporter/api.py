@@ -1,10 +1,49 @@
-
+from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Iterator, MutableMapping
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime, UTC, timedelta
-import httpx
+from importlib.util import find_spec
+import re
+from typing import TYPE_CHECKING
 from loguru import logger
-from pydantic_core import ValidationError
+from qissuereporter.json_stream import JsonArrayStream
+
+if TYPE_CHECKING:
+    import httpx
+
+
+_page_re: re.Pattern = re.compile(r'[?&]page=(\d+)')
+
+
+def _httpx():
+    import httpx
+    return httpx
+
+
+class ApiError(Exception):
+    pass
+
+
+class RequestCount:
+    def __init__(self) -> None:
+        self.responses: int = 0
+        self.errors: int = 0
+
+
+_request_count: ContextVar[RequestCount | None] = ContextVar('request_count', default=None)
+
+
+@contextmanager
+def count_requests() -> Iterator[RequestCount]:
+    count = RequestCount()
+    token = _request_count.set(count)
+    try:
+        yield count
+    finally:
+        _request_count.reset(token)
 
 
 def header(token: str):
@@ -17,42 +56,251 @@ def header(token: str):
     return result
 
 
-async def create_issue(url: str, token: str, body: dict):
-    async with httpx.AsyncClient() as client:
+class ApiSession:
+    def __init__(self, timeout: float = 3, connect_timeout: float | None = None,
+                 http2: bool = False, max_connections: int = 10,
+                 max_keepalive: int = 5, keepalive_expiry: float = 30) -> None:
+        if http2 and find_spec('h2') is None:
+            logger.warning('HTTP/2 requires "httpx[http2]", falling back to HTTP/1.1')
+            http2 = False
+        self.http2: bool = http2
+        httpx = _httpx()
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout or timeout)
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self._client: httpx.AsyncClient | None = None
+        self.responses: int = 0
+        self.errors: int = 0
+        self.rate_remaining: int | None = None
+        self.rate_reset: float | None = None
+        self.retry_at: float = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = _httpx().AsyncClient(http2=self.http2,
+                                                timeout=self.timeout,
+                                                limits=self.limits,
+                                                event_hooks={'response': [self._track]})
+        return self._client
+
+    async def _track(self, response: httpx.Response) -> None:
+        self.responses += 1
+        count: RequestCount | None = _request_count.get()
+        if count is not None:
+            count.responses += 1
+        remaining: str | None = response.headers.get('x-ratelimit-remaining')
+        reset: str | None = response.headers.get('x-ratelimit-reset')
+        if remaining and remaining.isdigit():
+            self.rate_remaining = int(remaining)
+        if reset and reset.isdigit():
+            self.rate_reset = float(reset)
+        if response.status_code < 400:
+            return
+        self.errors += 1
+        if count is not None:
+            count.errors += 1
+        delay: float | None = retry_delay(response)
+        if delay is not None:
+            self.retry_at = max(self.retry_at, datetime.now(UTC).timestamp() + delay)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@asynccontextmanager
+async def client_scope(session: ApiSession | None) -> AsyncIterator[httpx.AsyncClient]:
+    if session is not None:
+        yield session.client
+        return
+    async with _httpx().AsyncClient(timeout=3) as client:
+        yield client
+
+
+async def post_issue(url: str, token: str, body: dict,
+                     session: ApiSession | None = None) -> httpx.Response:
+    async with client_scope(session) as client:
+        return await client.post(url, headers=header(token), json=body)
+
+
+async def create_issue(url: str, token: str, body: dict,
+                       session: ApiSession | None = None):
+    try:
+        response: httpx.Response = await post_issue(url, token, body, session)
+    except Exception as err:
+        logger.error(err)
+        return False
+    if response.status_code != 201:
+        logger.error(f'{url} {response.reason_phrase}{response.text}')
+        return False
+    return True
+
+
+def retry_delay(response: httpx.Response) -> float | None:
+    retry_after: str | None = response.headers.get('retry-after')
+    if retry_after is not None:
         try:
-            response: httpx.Response = await client.post(url, headers=header(token),
-                                                        json=body, timeout=3)
-        except Exception as err:
-            logger.error(err)
-            return False
-        if response.status_code != 201:
-            logger.error(f'{url} {response.reason_phrase}{response.text}')
-            return False
-        return True
-
-async def get_issues(url: str, token: str) -> list[dict]:
-    async with httpx.AsyncClient() as client:
-        if not token.endswith('?state=all'):
-            url += '?state=all'
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    if response.headers.get('x-ratelimit-remaining') == '0':
+        reset: str | None = response.headers.get('x-ratelimit-reset')
+        if reset and reset.isdigit():
+            return max(0.0, int(reset) - datetime.now(UTC).timestamp())
+    return None
+
+async def get_issues(url: str, token: str,
+                     session: ApiSession | None = None) -> list[dict]:
+    issues: list[dict] = []
+    async for page in iter_issue_pages(url, token, session=session):
+        issues.extend(page)
+    return issues
+
+
+def parse_last_page(link: str) -> int:
+    for part in link.split(','):
+        if 'rel="last"' not in part:
+            continue
+        match: re.Match | None = _page_re.search(part)
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def _page_request(url: str, token: str, page: int, per_page: int,
+                  since: str | None, etags: MutableMapping[str, str] | None
+                  ) -> tuple[dict[str, str | int], dict[str, str], str]:
+    params: dict[str, str | int] = {'state': 'all', 'per_page': per_page,
+                                    'page': page}
+    if since:
+        params.update(since=since, sort='updated', direction='desc')
+    headers: dict[str, str] = header(token)
+    key: str = str(_httpx().URL(url, params=params))
+    if etags is not None and key in etags:
+        headers['If-None-Match'] = etags[key]
+    return params, headers, key
+
+
+async def _get_page(client: httpx.AsyncClient, url: str, token: str,
+                    page: int, per_page: int, since: str | None = None,
+                    etags: MutableMapping[str, str] | None = None
+                    ) -> httpx.Response:
+    params, headers, key = _page_request(url, token, page, per_page, since, etags)
+    try:
+        response: httpx.Response = await client.get(url, headers=headers,
+                                                    params=params)
+    except Exception as err:
+        raise ApiError(f'{url} page {page}: {err or type(err).__name__}') from err
+    if response.status_code == 304:
+        return response
+    if response.status_code != 200:
+        raise ApiError(f'{url} page {page}: {response.status_code} '
+                       f'{response.reason_phrase} {response.text}')
+    if etags is not None and 'etag' in response.headers:
+        etags[key] = response.headers['etag']
+    return response
+
+
+def _page_json(response: httpx.Response) -> list[dict]:
+    if response.status_code == 304:
+        return []
+    try:
+        return response.json()
+    except ValueError as err:
+        raise ApiError(f'{response.url}: {err}') from err
+
+
+async def iter_issue_pages(url: str, token: str, per_page: int = 100,
+                           concurrency: int = 4,
+                           session: ApiSession | None = None,
+                           since: str | None = None,
+                           etags: MutableMapping[str, str] | None = None
+                           ) -> AsyncIterator[list[dict]]:
+    async with client_scope(session) as client:
+        first: httpx.Response = await _get_page(client, url, token, 1,
+                                                per_page, since, etags)
+        if first.status_code == 304:
+            return
+        last_page: int = parse_last_page(first.headers.get('link', ''))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> list[dict]:
+            async with semaphore:
+                return _page_json(await _get_page(client, url, token, page,
+                                                  per_page, since, etags))
+
+        tasks: list[asyncio.Task[list[dict]]] = [
+            asyncio.create_task(fetch(page)) for page in range(2, last_page + 1)
+        ]
         try:
-            response: httpx.Response = await client.get(url, headers=header(token),
-                                                        timeout=3)
-        except Exception as err:
-            logger.error(err)
-            return []
-        if response.status_code != 200:
-            logger.error(f'{url} {response.reason_phrase}{response.text}')
-        else:
+            yield _page_json(first)
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+
+async def iter_issues(url: str, token: str, per_page: int = 100,
+                      session: ApiSession | None = None,
+                      since: str | None = None,
+                      etags: MutableMapping[str, str] | None = None
+                      ) -> AsyncIterator[dict]:
+    async with client_scope(session) as client:
+        page: int = 1
+        last_page: int = 1
+        while page <= last_page:
+            params, headers, key = _page_request(url, token, page, per_page,
+                                                 since, etags)
             try:
-                return response.json()
-                # return [ResponseModel.model_validate(issue) for issue in response.json()]
-            except ValidationError as e:
-                print(e.errors())
-        return []
+                async with client.stream('GET', url, headers=headers,
+                                         params=params) as response:
+                    if response.status_code == 304:
+                        if page == 1:
+                            return
+                    elif response.status_code != 200:
+                        await response.aread()
+                        raise ApiError(f'{url} page {page}: {response.status_code} '
+                                       f'{response.reason_phrase} {response.text}')
+                    else:
+                        if page == 1:
+                            last_page = parse_last_page(response.headers.get('link', ''))
+                        stream = JsonArrayStream()
+                        async for chunk in response.aiter_bytes():
+                            for issue in stream.feed(chunk):
+                                yield issue
+                        if etags is not None and 'etag' in response.headers:
+                            etags[key] = response.headers['etag']
+            except ApiError:
+                raise
+            except Exception as err:
+                raise ApiError(f'{url} page {page}: {err or type(err).__name__}') from err
+            page += 1
+
+
+async def iter_issue_batches(issues: AsyncIterator[dict],
+                             size: int = 25) -> AsyncIterator[list[dict]]:
+    batch: list[dict] = []
+    async for issue in issues:
+        batch.append(issue)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 def calc_delta(created_at: str) -> str:
-    creation_delta: timedelta = datetime.now(UTC) - datetime.fromisoformat(created_at)
+    return format_delta(datetime.fromisoformat(created_at))
+
+
+def format_delta(moment: datetime, now: datetime | None = None) -> str:
+    creation_delta: timedelta = (now or datetime.now(UTC)) - moment
     days: int = creation_delta.days
     if days < 0:
         return 'now'
@@ -68,6 +316,27 @@ def calc_delta(created_at: str) -> str:
     return f'{days} day{"s" if days > 1 else ""} ago'
 
 
+def next_change(moment: datetime, now: datetime | None = None) -> float:
+    creation_delta: timedelta = (now or datetime.now(UTC)) - moment
+    total: float = creation_delta.total_seconds()
+    if creation_delta.days < 0:
+        return max(1.0, -total)
+    if creation_delta.days > 0:
+        return max(1.0, 86400 * (creation_delta.days + 1) - total)
+    seconds: int = creation_delta.seconds
+    if round(seconds / 3600):
+        step, limit = 3600, 86400
+    elif round(seconds / 60):
+        step, limit = 60, 1801
+    else:
+        return 1.0
+    unit: int = round(seconds / step)
+    boundary: int = step * unit + step // 2
+    if round(boundary / step) == unit:
+        boundary += 1
+    return max(1.0, min(boundary, limit) - total)
+
+
 async def test_api():
     # await create_issue()
     answer = await get_issues('', '')
@@ -0,0 +1,167 @@
+import asyncio
+import base64
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+import httpx
+from qissuereporter.api import ApiSession, client_scope
+from qissuereporter.models import AttachmentModel, BugReportModel
+from qissuereporter.utils import content_hash
+
+
+class AttachmentError(Exception):
+    pass
+
+
+class AttachmentBackend(ABC):
+    @abstractmethod
+    async def upload(self, data: bytes, content_type: str = 'image/jpeg') -> str:
+        ...
+
+
+class LocalAttachmentBackend(AttachmentBackend):
+    def __init__(self, directory: Path) -> None:
+        self.directory: Path = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def upload(self, data: bytes, content_type: str = 'image/jpeg') -> str:
+        path: Path = self.directory / content_hash(data)
+        if not path.exists():
+            await asyncio.to_thread(path.write_bytes, data)
+        return path.resolve().as_uri()
+
+
+class HttpAttachmentBackend(AttachmentBackend):
+    def __init__(self, base_url: str, token: str = '',
+                 session: ApiSession | None = None) -> None:
+        self.base_url: str = base_url.rstrip('/')
+        self.token: str = token
+        self.session: ApiSession | None = session
+
+    async def upload(self, data: bytes, content_type: str = 'image/jpeg') -> str:
+        url: str = f'{self.base_url}/{content_hash(data)}'
+        headers: dict[str, str] = {'Content-Type': content_type}
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+        async with client_scope(self.session) as client:
+            response: httpx.Response = await client.put(url, content=data,
+                                                        headers=headers)
+        if response.status_code not in (200, 201, 204):
+            raise AttachmentError(f'{url} {response.reason_phrase}{response.text}')
+        return response.headers.get('location', url)
+
+
+async def upload_attachments(report: BugReportModel,
+                             backend: AttachmentBackend) -> BugReportModel:
+    raw_images: list[bytes] = [base64.b64decode(image) for image in report.images]
+    urls: list[str] = await asyncio.gather(*[backend.upload(data)
+                                             for data in raw_images])
+    attachments: list[AttachmentModel] = [
+        AttachmentModel(url=url, sha256=content_hash(data), size=len(data))
+        for url, data in zip(urls, raw_images)
+    ]
+    return report.model_copy(update={'images': [],
+                                     'attachments': report.attachments + attachments})
+
+
+MAX_ATTACHMENT_SIZE: int = 20 * 1024 * 1024
+
+
+def _read_local(path: Path, limit: int) -> bytes:
+    with path.open('rb') as file:
+        return file.read(limit + 1)
+
+
+async def fetch_attachment(attachment: AttachmentModel,
+                           session: ApiSession | None = None,
+                           local_directory: Path | None = None,
+                           max_size: int = MAX_ATTACHMENT_SIZE) -> bytes:
+    if attachment.size > max_size:
+        raise AttachmentError(f'{attachment.url} is larger than {max_size} bytes')
+    limit: int = attachment.size or max_size
+    parsed = urlparse(attachment.url)
+    if parsed.scheme == 'file':
+        if local_directory is None:
+            raise AttachmentError(f'{attachment.url} local attachments are disabled')
+        path = Path(url2pathname(parsed.path)).resolve()
+        if not path.is_relative_to(local_directory.resolve()) or not path.is_file():
+            raise AttachmentError(f'{attachment.url} is outside {local_directory}')
+        data: bytes = await asyncio.to_thread(_read_local, path, limit)
+    elif parsed.scheme in ('http', 'https'):
+        chunks: list[bytes] = []
+        received: int = 0
+        async with client_scope(session) as client:
+            async with client.stream('GET', attachment.url) as response:
+                if response.status_code != 200:
+                    raise AttachmentError(f'{attachment.url} {response.reason_phrase}')
+                length: str | None = response.headers.get('content-length')
+                if length and length.isdigit() and int(length) > limit:
+                    raise AttachmentError(f'{attachment.url} is larger than {limit} bytes')
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received > limit:
+                        break
+                    chunks.append(chunk)
+        if received > limit:
+            raise AttachmentError(f'{attachment.url} is larger than {limit} bytes')
+        data = b''.join(chunks)
+    else:
+        raise AttachmentError(f'{attachment.url} unsupported scheme')
+    if len(data) > limit:
+        raise AttachmentError(f'{attachment.url} is larger than {limit} bytes')
+    if content_hash(data) != attachment.sha256:
+        raise AttachmentError(f'{attachment.url} content hash mismatch')
+    return data
+
+
+class AttachmentServer(ThreadingHTTPServer):
+    def __init__(self, directory: Path, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.directory: Path = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        super().__init__((host, port), _AttachmentHandler)
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+    def start(self) -> None:
+        Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _AttachmentHandler(BaseHTTPRequestHandler):
+    server: AttachmentServer
+
+    def _path(self) -> Path | None:
+        name: str = self.path.strip('/').rsplit('/', 1)[-1]
+        if not name.isalnum():
+            return None
+        return self.server.directory / name
+
+    def do_PUT(self):
+        path: Path | None = self._path()
+        data: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if path is None or content_hash(data) != path.name:
+            self.send_error(400)
+            return
+        path.write_bytes(data)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        path: Path | None = self._path()
+        if path is None or not path.is_file():
+            self.send_error(404)
+            return
+        data: bytes = path.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
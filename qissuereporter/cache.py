@@ -0,0 +1,105 @@
+import asyncio
+import json
+import sqlite3
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+from qissuereporter.utils import cache_dir
+
+
+ISSUE_FIELDS: tuple[str, ...] = ('number', 'title', 'state', 'state_reason',
+                                 'type', 'created_at', 'closed_at',
+                                 'updated_at', 'html_url', 'body')
+
+
+def decode_rows(rows: list[str]) -> list[dict]:
+    return [json.loads(data) for data in rows]
+
+
+class EtagStore(MutableMapping[str, str]):
+    def __init__(self, connection: sqlite3.Connection, repo: str) -> None:
+        self.connection: sqlite3.Connection = connection
+        self.repo: str = repo
+
+    def __getitem__(self, key: str) -> str:
+        row = self.connection.execute(
+            'SELECT etag FROM etags WHERE repo = ? AND request = ?',
+            (self.repo, key)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO etags (repo, request, etag) VALUES (?, ?, ?)',
+                (self.repo, key, value))
+
+    def __delitem__(self, key: str) -> None:
+        with self.connection:
+            cursor = self.connection.execute(
+                'DELETE FROM etags WHERE repo = ? AND request = ?', (self.repo, key))
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self.connection.execute('SELECT request FROM etags WHERE repo = ?',
+                                       (self.repo,)).fetchall()
+        return iter(row[0] for row in rows)
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM etags WHERE repo = ?',
+                                       (self.repo,)).fetchone()[0]
+
+
+class IssueCache:
+    def __init__(self, repo: str, path: Path | None = None) -> None:
+        self.repo: str = repo
+        self.path: Path = path or cache_dir() / 'issues.sqlite3'
+        self.connection = sqlite3.connect(self.path)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS issues ('
+                                    'repo TEXT, number INTEGER, updated_at TEXT, '
+                                    'data TEXT, PRIMARY KEY (repo, number))')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS etags ('
+                                    'repo TEXT, request TEXT, etag TEXT, '
+                                    'PRIMARY KEY (repo, request))')
+        self.etags = EtagStore(self.connection, repo)
+
+    def rows(self) -> list[str]:
+        rows = self.connection.execute('SELECT data FROM issues WHERE repo = ? '
+                                       'ORDER BY number DESC', (self.repo,))
+        return [row[0] for row in rows]
+
+    def issues(self) -> list[dict]:
+        return decode_rows(self.rows())
+
+    async def issues_async(self) -> list[dict]:
+        return await asyncio.to_thread(decode_rows, self.rows())
+
+    def last_updated(self) -> str | None:
+        return self.connection.execute('SELECT MAX(updated_at) FROM issues '
+                                       'WHERE repo = ?', (self.repo,)).fetchone()[0]
+
+    def upsert(self, issues: list[dict], etags: dict[str, str] | None = None) -> None:
+        rows: list[tuple[str, int, str, str]] = []
+        for issue in issues:
+            data: dict = {field: issue.get(field) for field in ISSUE_FIELDS}
+            rows.append((self.repo, issue['number'], issue.get('updated_at') or '',
+                         json.dumps(data)))
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO issues '
+                                        '(repo, number, updated_at, data) '
+                                        'VALUES (?, ?, ?, ?)', rows)
+            if etags:
+                self.connection.executemany('INSERT OR REPLACE INTO etags '
+                                            '(repo, request, etag) VALUES (?, ?, ?)',
+                                            [(self.repo, key, etag)
+                                             for key, etag in etags.items()])
+
+    def clear(self) -> None:
+        with self.connection:
+            self.connection.execute('DELETE FROM issues WHERE repo = ?', (self.repo,))
+            self.connection.execute('DELETE FROM etags WHERE repo = ?', (self.repo,))
+
+    def close(self) -> None:
+        self.connection.close()
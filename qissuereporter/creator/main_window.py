@@ -1,32 +1,49 @@
 import asyncio
 from PyQt6 import QtWidgets, QtCore
-import qasync
 from qcustomwindow import CustomWindow
 import signal
 from qissuereporter.creator.report_widget import BugReport
 from qissuereporter.models import BugReportModel
-from qissuereporter.api import create_issue
+from qissuereporter.api import ApiSession
+from qissuereporter.attachments import AttachmentBackend
+from qissuereporter.outbox import Outbox
+from qissuereporter.cache import IssueCache
+from qissuereporter.parsing import parse_issues_async
+from qissuereporter.watchdog import StallWatchdog
 from qissuereporter import __version__
 
 
 class ReporterWindow(CustomWindow):
     report_created = QtCore.pyqtSignal(BugReportModel)
     def __init__(self, version: str, url: str, token: str,
-                 username: str = '') -> None:
+                 username: str = '', session: ApiSession | None = None,
+                 attachments: AttachmentBackend | None = None,
+                 cache: IssueCache | None = None,
+                 watchdog: StallWatchdog | None = None) -> None:
         super().__init__()
         self.url: str = url
         self.token: str = token
-        self.widget = BugReport(version, username)
+        self.session: ApiSession = session or ApiSession()
+        self.attachments: AttachmentBackend | None = attachments
+        self.outbox = Outbox(url, token, self.session, attachments)
+        self.outbox.on_delivered = self.report_created.emit
+        QtCore.QTimer.singleShot(0, self.outbox.start)
+        self.widget = BugReport(version, username, watchdog)
         self.setTitle('Issue Reporter')
         self.widget.report_created.connect(self.on_report_created)
         self.body_layout.addWidget(self.widget)
+        if cache is not None:
+            QtCore.QTimer.singleShot(0, lambda: asyncio.ensure_future(
+                self.load_known_issues(cache)))
 
-    @qasync.asyncSlot(BugReportModel)
-    async def on_report_created(self, report: BugReportModel) -> None:
-        result: bool = await create_issue(self.url, self.token, report.query())
-        if result:
-            self.widget.refresh_widget()
-            self.report_created.emit(report)
+    async def load_known_issues(self, cache: IssueCache) -> None:
+        self.widget.add_known_issues(await parse_issues_async(await cache.issues_async()))
+
+    def on_report_created(self, report: BugReportModel) -> None:
+        self.outbox.put(report)
+        if report.profiles and self.widget.watchdog is not None:
+            self.widget.watchdog.clear()
+        self.widget.refresh_widget()
 
 
 if __name__ == '__main__':
@@ -41,3 +58,5 @@ if __name__ == '__main__':
     w.show()
     with event_loop:
         event_loop.run_until_complete(app_close_event.wait())
+        event_loop.run_until_complete(w.outbox.stop())
+        event_loop.run_until_complete(w.session.aclose())
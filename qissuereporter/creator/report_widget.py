@@ -1,13 +1,23 @@
+import asyncio
+import qasync
+from html import escape
 from pathlib import Path
-from PyQt6 import QtWidgets, QtGui, QtCore
-from PyQt6.uic.load_ui import loadUi
+from PyQt6 import QtWidgets, QtGui, QtCore, sip
+from PyQt6.uic.load_ui import loadUiType
 from loguru import logger
-from qissuereporter.models import BugReportModel
+from qissuereporter.models import BugReportModel, IssueContentModel
+from qissuereporter.similarity import SimilarityIndex
+from qissuereporter.watchdog import StallWatchdog
+from qissuereporter.image_view.encoder import fit_budget
+from qissuereporter.image_view.decoder import decoder
 from qissuereporter.image_view.screenshot_mini import Screenshot
 from qissuereporter.creator.text_edit import CustomTextEdit
 
 
-class BugReport(QtWidgets.QWidget):
+BugReportForm, _ = loadUiType(str(Path(__file__).parent / 'bug_report.ui'))
+
+
+class BugReport(QtWidgets.QWidget, BugReportForm):
     report_button: QtWidgets.QPushButton
     compress_button: QtWidgets.QPushButton
     description_label_1: QtWidgets.QLabel
@@ -20,13 +30,21 @@ class BugReport(QtWidgets.QWidget):
     markdown_preview: QtWidgets.QTextBrowser
     quality_spin_box: QtWidgets.QSpinBox
     size_label: QtWidgets.QLabel
+    auto_fit_check_box: QtWidgets.QCheckBox
+    duplicates_label: QtWidgets.QLabel
+    size_limit: int = 0xFFFF
+    duplicate_score: float = 6.0
+    performance_type: str = 'Performance Issue (freeze, slow, crash)'
+    profiles_share: float = 0.5
 
     report_created = QtCore.pyqtSignal(BugReportModel)
-    def __init__(self, version: str, username: str = '') -> None:
+    def __init__(self, version: str, username: str = '',
+                 watchdog: StallWatchdog | None = None) -> None:
         super().__init__()
-        loadUi(Path(__file__).parent / 'bug_report.ui', self)
+        self.setupUi(self)
         self.version: str = version
         self.username: str = username
+        self.watchdog: StallWatchdog | None = watchdog
         self.images_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.text_edit = CustomTextEdit()
         self.text_edit.setPlaceholderText('Please enter details or insert image')
@@ -34,48 +52,143 @@ class BugReport(QtWidgets.QWidget):
         self.text_edit.image_inserted.connect(self.on_image_inserted)
         self.editor_tabs.currentChanged.connect(self.on_tab_changed)
         self.images: list[Screenshot] = []
+        self._report_task: asyncio.Task | None = None
+        self._compress_task: asyncio.Task | None = None
+        self.compress_timer = QtCore.QTimer(self)
+        self.compress_timer.setSingleShot(True)
+        self.compress_timer.setInterval(300)
+        self.compress_timer.timeout.connect(self.on_compress_button_pressed)
+        self.quality_spin_box.valueChanged.connect(self.compress_timer.start)
+        self.auto_fit_check_box.toggled.connect(self.on_auto_fit_toggled)
+        self.known_issues = SimilarityIndex()
+        self.duplicates_label.hide()
+        self.duplicates_timer = QtCore.QTimer(self)
+        self.duplicates_timer.setSingleShot(True)
+        self.duplicates_timer.setInterval(250)
+        self.duplicates_timer.timeout.connect(self.update_duplicates)
+        self.title_line_edit.textChanged.connect(self.duplicates_timer.start)
+        self.text_edit.textChanged.connect(self.duplicates_timer.start)
+
+    def add_known_issues(self, issues: list[IssueContentModel]):
+        self.known_issues.add_issues(issues)
+
+    def update_duplicates(self):
+        title: str = self.title_line_edit.text()
+        details: str = self.text_edit.toPlainText()[:1000]
+        if not title and not details:
+            self.duplicates_label.hide()
+            return
+        matches = self.known_issues.query(f'{title} {title} {details}', 3,
+                                          self.duplicate_score)
+        if not matches:
+            self.duplicates_label.hide()
+            return
+        links: str = '<br>'.join(f'<a href="{escape(issue.url)}">#{issue.number} '
+                                 f'{escape(issue.title)}</a>'
+                                 for _, issue in matches)
+        self.duplicates_label.setText(f'Possible duplicates:<br>{links}')
+        self.duplicates_label.show()
 
     def on_tab_changed(self):
         if self.editor_tabs.currentIndex() == 1:
             self.markdown_preview.setMarkdown(self.text_edit.toPlainText())
 
+    def on_auto_fit_toggled(self, checked: bool):
+        self.quality_spin_box.setEnabled(not checked)
+        self.compress_timer.start()
+
     def on_compress_button_pressed(self):
-        full_size = 0
-        if not self.images:
+        if self._compress_task is not None:
+            self._compress_task.cancel()
+        self._compress_task = asyncio.create_task(self.update_compression())
+        self._compress_task.add_done_callback(self.on_compression_done)
+
+    def on_compression_done(self, task: asyncio.Task):
+        if task is self._compress_task:
+            self._compress_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error('Failed to compress images')
+
+    async def update_compression(self):
+        quality: int = self.quality_spin_box.value()
+        auto_fit: bool = self.auto_fit_check_box.isChecked()
+        images_b64: list[str] = await self.encode_images()
+        if (quality, auto_fit) != (self.quality_spin_box.value(),
+                                   self.auto_fit_check_box.isChecked()):
             return
-        for image in self.images:
-            image.recompress(self.quality_spin_box.value())
-            full_size += len(image.imageb64) + 50
-        full_size += len(self.text_edit.toPlainText())
+        full_size: int = len(self.build_report(images_b64).query()['body'])
         self.size_label.setText(f'{full_size}')
-        if full_size > 0xFFFF:
+        if full_size > self.size_limit:
             self.size_label.setStyleSheet('color: red;')
         else:
             self.size_label.setStyleSheet('color: palette(text);')
 
-    def on_report_button_pressed(self):
-        details: str = self.text_edit.toPlainText()
-        title: str = self.title_line_edit.text()
-        if not title:
-            logger.warning('Title must not be empty')
-            return
-        if not details:
-            logger.warning('Details must not be empty')
-            return
-        report_type: str = self.combo_box.currentText()
-        images_b64: list[str] = [image.imageb64 for image in self.images]
+    async def encode_images(self) -> list[str]:
+        if self.auto_fit_check_box.isChecked():
+            return await self.auto_fit()
+        quality: int = self.quality_spin_box.value()
+        return await asyncio.gather(*[image.encode(quality)
+                                      for image in self.images])
+
+    async def auto_fit(self) -> list[str]:
+        empty_report: BugReportModel = self.build_report([''] * len(self.images))
+        budget: int = self.size_limit - len(empty_report.query()['body'])
+        images: list[Screenshot] = sorted(self.images, key=lambda image:
+                                          image.source.width() * image.source.height())
+        for index, image in enumerate(images):
+            share: int = budget // (len(images) - index)
+            quality, scale, result = await fit_budget(image.variant, share)
+            await image.encode(quality, scale)
+            image.setToolTip(f'JPEG quality {quality}, scale {scale:.2f}')
+            logger.info(f'Auto-fit image: quality {quality}, scale {scale:.2f}, '
+                        f'{len(result)} bytes')
+            budget -= len(result)
+        return [image.imageb64 for image in self.images]
+
+    def build_report(self, images_b64: list[str]) -> BugReportModel:
         full_size = 0
         for image_data in images_b64:
             full_size += len(image_data)
-        report = BugReportModel(report_type=report_type,
-                                title=title,
-                                details=details,
+        report = BugReportModel(report_type=self.combo_box.currentText(),
+                                title=self.title_line_edit.text(),
+                                details=self.text_edit.toPlainText(),
                                 images=images_b64,
                                 username=self.username,
                                 version=self.version,
                                 images_size=full_size,
                                 client_version=self.version)
-        self.report_created.emit(report)
+        if self.watchdog is not None and report.report_type == self.performance_type:
+            without_images: BugReportModel = report.model_copy(
+                update={'images': [''] * len(images_b64)})
+            budget: int = self.size_limit - len(without_images.query()['body']) - 32
+            if images_b64:
+                budget = int(budget * self.profiles_share)
+            if budget > 0:
+                report.profiles = self.watchdog.export(max_bytes=budget)
+        return report
+
+    def on_report_button_pressed(self):
+        if self._report_task is not None and not self._report_task.done():
+            return
+        self.report_button.setEnabled(False)
+        self._report_task = asyncio.create_task(self.create_report())
+        self._report_task.add_done_callback(self.on_report_done)
+
+    def on_report_done(self, task: asyncio.Task):
+        self._report_task = None
+        self.report_button.setEnabled(True)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error('Failed to create the report')
+
+    async def create_report(self):
+        if not self.title_line_edit.text():
+            logger.warning('Title must not be empty')
+            return
+        if not self.text_edit.toPlainText():
+            logger.warning('Details must not be empty')
+            return
+        images_b64: list[str] = await self.encode_images()
+        self.report_created.emit(self.build_report(images_b64))
 
     def refresh_widget(self):
         self.text_edit.clear()
@@ -84,16 +197,26 @@ class BugReport(QtWidgets.QWidget):
             widget.deleteLater()
         self.images.clear()
         self.combo_box.setCurrentIndex(0)
+        self.duplicates_label.hide()
 
-    def on_image_inserted(self, image: QtGui.QImage):
-        if self.images_layout.count() < 5:
-            widget = Screenshot(image)
-            widget.about_to_close.connect(self.image_deleted)
-            self.images_layout.addWidget(widget)
-            self.images.append(widget)
-            self.on_compress_button_pressed()
-        else:
+    @qasync.asyncSlot(QtGui.QImage)
+    async def on_image_inserted(self, image: QtGui.QImage):
+        if self.images_layout.count() >= 5:
             logger.warning('Maximum 5 screenshots')
+            return
+        widget = Screenshot(image)
+        widget.about_to_close.connect(self.image_deleted)
+        self.images_layout.addWidget(widget)
+        self.images.append(widget)
+        digest: str = await decoder.digest(image)
+        if sip.isdeleted(widget) or widget not in self.images:
+            return
+        widget.digest = digest
+        if any(other is not widget and other.digest == digest for other in self.images):
+            logger.warning('Image is already attached')
+            widget.close_button_clicked()
+            return
+        self.on_compress_button_pressed()
 
     def image_deleted(self, image: Screenshot):
         self.images.remove(image)
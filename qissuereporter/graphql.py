@@ -0,0 +1,95 @@
+from collections.abc import AsyncIterator
+from urllib.parse import urlparse
+import httpx
+from qissuereporter.api import ApiError, ApiSession, client_scope, header
+
+
+GRAPHQL_URL = 'https://api.github.com/graphql'
+
+ISSUES_QUERY = '''
+query($owner: String!, $name: String!, $first: Int!, $after: String,
+      $withBody: Boolean!, $filterBy: IssueFilters, $orderBy: IssueOrder) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, filterBy: $filterBy, orderBy: $orderBy) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        state
+        stateReason
+        issueType { name }
+        createdAt
+        closedAt
+        updatedAt
+        url
+        body @include(if: $withBody)
+      }
+    }
+  }
+}
+'''
+
+
+def repository_from_url(url: str) -> tuple[str, str]:
+    parts: list[str] = [part for part in urlparse(url).path.split('/') if part]
+    if 'repos' in parts:
+        parts = parts[parts.index('repos') + 1:]
+    if len(parts) < 2:
+        raise ValueError(f'Cannot find owner/repository in {url!r}')
+    return parts[0], parts[1]
+
+
+def rest_issue(node: dict) -> dict:
+    state_reason: str | None = node.get('stateReason')
+    issue_type: dict | None = node.get('issueType')
+    return {
+        'number': node['number'],
+        'title': node['title'],
+        'state': node['state'].lower(),
+        'state_reason': state_reason.lower() if state_reason else None,
+        'type': {'name': issue_type['name']} if issue_type else None,
+        'created_at': node['createdAt'],
+        'closed_at': node.get('closedAt'),
+        'updated_at': node.get('updatedAt'),
+        'html_url': node['url'],
+        'body': node.get('body', ''),
+    }
+
+
+async def iter_issue_pages_graphql(url: str, token: str, per_page: int = 100,
+                                   session: ApiSession | None = None,
+                                   since: str | None = None,
+                                   with_body: bool = True,
+                                   endpoint: str = GRAPHQL_URL
+                                   ) -> AsyncIterator[list[dict]]:
+    owner, name = repository_from_url(url)
+    variables: dict = {'owner': owner, 'name': name, 'first': per_page,
+                       'after': None, 'withBody': with_body}
+    if since:
+        variables['filterBy'] = {'since': since}
+        variables['orderBy'] = {'field': 'UPDATED_AT', 'direction': 'DESC'}
+    else:
+        variables['orderBy'] = {'field': 'CREATED_AT', 'direction': 'DESC'}
+    async with client_scope(session) as client:
+        while True:
+            try:
+                response: httpx.Response = await client.post(
+                    endpoint, headers=header(token),
+                    json={'query': ISSUES_QUERY, 'variables': variables})
+            except Exception as err:
+                raise ApiError(f'{endpoint}: {err or type(err).__name__}') from err
+            if response.status_code != 200:
+                raise ApiError(f'{endpoint}: {response.status_code} '
+                               f'{response.reason_phrase} {response.text}')
+            try:
+                answer: dict = response.json()
+            except ValueError as err:
+                raise ApiError(f'{endpoint}: {err}') from err
+            if answer.get('errors'):
+                raise ApiError(f'{endpoint}: {answer["errors"]}')
+            issues: dict = answer['data']['repository']['issues']
+            yield [rest_issue(node) for node in issues['nodes']]
+            page_info: dict = issues['pageInfo']
+            if not page_info['hasNextPage']:
+                return
+            variables['after'] = page_info['endCursor']
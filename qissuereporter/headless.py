@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import io
+import json
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+from loguru import logger
+from pydantic import ValidationError
+from qissuereporter.api import ApiSession, post_issue, retry_delay
+from qissuereporter.attachments import AttachmentBackend, upload_attachments
+from qissuereporter.models import BugReportModel
+
+
+class SubmitResult(NamedTuple):
+    source: str
+    title: str
+    ok: bool
+    status: int | None = None
+    url: str = ''
+    error: str = ''
+
+
+class ReportSource(NamedTuple):
+    source: str
+    report: BugReportModel | None
+    error: str = ''
+
+
+def compress_file(path: Path, quality: int = 70, max_size: int = 2560) -> str:
+    from PIL import Image, ImageOps
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        image.thumbnail((max_size, max_size))
+        buffered = io.BytesIO()
+        image.save(buffered, optimize=True, format='JPEG', quality=quality)
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
+def read_report_data(text: str, name: str) -> list[dict]:
+    if name.endswith(('.md', '.txt')) or not text.lstrip().startswith(('{', '[')):
+        title, _, details = text.strip().partition('\n')
+        return [{'title': title.lstrip('# ').strip(), 'details': details.strip()}]
+    data: dict | list[dict] = json.loads(text)
+    return data if isinstance(data, list) else [data]
+
+
+async def build_report(data: dict, base_dir: Path, defaults: dict,
+                       quality: int = 70) -> BugReportModel:
+    fields: dict = {**defaults, **data}
+    image_paths: list[str] = fields.pop('images', [])
+    images: list[str] = await asyncio.gather(*[
+        asyncio.to_thread(compress_file, base_dir / image_path, quality)
+        for image_path in image_paths
+    ])
+    fields.setdefault('client_version', fields.get('version', ''))
+    return BugReportModel(images=images,
+                          images_size=sum(len(image) for image in images),
+                          **fields)
+
+
+async def _build(name: str, data: dict, base_dir: Path, defaults: dict,
+                 quality: int) -> ReportSource:
+    try:
+        return ReportSource(name, await build_report(data, base_dir, defaults, quality))
+    except (OSError, ValidationError, TypeError) as err:
+        return ReportSource(name, None, str(err))
+
+
+async def load_reports(sources: Iterable[str], defaults: dict | None = None,
+                       quality: int = 70) -> list[ReportSource]:
+    defaults = {'report_type': 'Bug Report', 'version': '', **(defaults or {})}
+    result: list[asyncio.Future[ReportSource]] = []
+    for source in sources:
+        try:
+            if source == '-':
+                text: str = sys.stdin.read()
+                base_dir: Path = Path.cwd()
+            else:
+                path = Path(source)
+                text = await asyncio.to_thread(path.read_text, encoding='utf-8')
+                base_dir = path.parent
+            items: list[dict] = read_report_data(text, source)
+        except (OSError, ValueError) as err:
+            future: asyncio.Future[ReportSource] = asyncio.get_running_loop().create_future()
+            future.set_result(ReportSource(source, None, str(err)))
+            result.append(future)
+            continue
+        for index, data in enumerate(items):
+            name: str = source if len(items) == 1 else f'{source}[{index}]'
+            result.append(asyncio.ensure_future(_build(name, data, base_dir, defaults,
+                                                       quality)))
+    return list(await asyncio.gather(*result))
+
+
+async def submit_report(source: str, report: BugReportModel, url: str, token: str,
+                        session: ApiSession,
+                        attachments: AttachmentBackend | None = None
+                        ) -> SubmitResult:
+    try:
+        if attachments is not None and report.images:
+            report = await upload_attachments(report, attachments)
+        response = await post_issue(url, token, report.query(), session)
+    except Exception as err:
+        return SubmitResult(source, report.title, False, error=str(err) or type(err).__name__)
+    if response.status_code == 201:
+        try:
+            issue_url: str = response.json().get('html_url', '')
+        except ValueError:
+            issue_url = ''
+        return SubmitResult(source, report.title, True, 201, issue_url)
+    error: str = f'{response.reason_phrase} {response.text}'.strip()
+    delay: float | None = retry_delay(response)
+    if delay is not None:
+        error += f' (retry in {delay:.0f} s)'
+    return SubmitResult(source, report.title, False, response.status_code, error=error)
+
+
+async def submit_reports(reports: list[ReportSource], url: str, token: str,
+                         concurrency: int = 4, session: ApiSession | None = None,
+                         attachments: AttachmentBackend | None = None
+                         ) -> list[SubmitResult]:
+    own_session: bool = session is None
+    session = session or ApiSession(max_connections=concurrency,
+                                    max_keepalive=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(item: ReportSource) -> SubmitResult:
+        if item.report is None:
+            return SubmitResult(item.source, '', False, error=item.error)
+        async with semaphore:
+            result: SubmitResult = await submit_report(item.source, item.report, url,
+                                                       token, session, attachments)
+        if result.ok:
+            logger.info(f'{item.source}: created {result.url}')
+        else:
+            logger.error(f'{item.source}: {result.error}')
+        return result
+
+    try:
+        return await asyncio.gather(*[submit(item) for item in reports])
+    finally:
+        if own_session:
+            await session.aclose()
+
+
+async def submit_files(sources: Iterable[str], url: str, token: str,
+                       concurrency: int = 4, quality: int = 70,
+                       defaults: dict | None = None,
+                       session: ApiSession | None = None,
+                       attachments: AttachmentBackend | None = None
+                       ) -> list[SubmitResult]:
+    reports: list[ReportSource] = await load_reports(sources, defaults, quality)
+    return await submit_reports(reports, url, token, concurrency, session, attachments)
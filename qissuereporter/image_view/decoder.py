@@ -0,0 +1,172 @@
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from PyQt6 import QtGui, QtCore
+from qissuereporter.image_view.image_cache import ImageCache, image_digest
+from qissuereporter.parsing import image_payload
+from qissuereporter.utils import content_hash
+
+
+def decode_image(data: str | bytes, max_size: int = 0) -> QtGui.QImage:
+    if isinstance(data, str):
+        data = base64.b64decode(image_payload(data))
+    image: QtGui.QImage = QtGui.QImage.fromData(data)
+    if max_size and max(image.width(), image.height()) > max_size:
+        image = image.scaled(max_size, max_size,
+                             QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                             QtCore.Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+class DecodedImage(NamedTuple):
+    key: str
+    thumbnail: QtGui.QImage
+
+
+def make_thumbnail(image: QtGui.QImage, height: int,
+                   device_pixel_ratio: float = 1.0) -> QtGui.QImage:
+    pixels: int = max(1, round(height * device_pixel_ratio))
+    if image.height() > pixels:
+        image = image.scaledToHeight(pixels, QtCore.Qt.TransformationMode.SmoothTransformation)
+    else:
+        image = image.copy()
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+def encode_png(image: QtGui.QImage) -> bytes:
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, 'PNG')
+    buffer.close()
+    return data.data()
+
+
+def _payload(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        return base64.b64decode(image_payload(data))
+    return data
+
+
+def decode_cached(data: str | bytes, max_size: int, cache: ImageCache | None,
+                  key: str | None, thumbnail_height: int,
+                  device_pixel_ratio: float) -> DecodedImage:
+    data = _payload(data)
+    key = key or content_hash(data)
+    if cache is not None:
+        cached: DecodedImage | None = load_cached(cache, key, thumbnail_height,
+                                                  device_pixel_ratio)
+        if cached is not None:
+            return cached
+    image: QtGui.QImage = decode_image(data, max_size)
+    thumbnail: QtGui.QImage = make_thumbnail(image, thumbnail_height,
+                                             device_pixel_ratio)
+    if cache is not None:
+        cache.put(key, data)
+        cache.put(key, encode_png(thumbnail),
+                  thumbnail_variant(thumbnail_height, device_pixel_ratio))
+    return DecodedImage(key, thumbnail)
+
+
+def thumbnail_variant(height: int, device_pixel_ratio: float) -> str:
+    return f'thumb{round(height * device_pixel_ratio)}'
+
+
+def load_cached(cache: ImageCache, key: str, thumbnail_height: int,
+                device_pixel_ratio: float) -> DecodedImage | None:
+    variant: str = thumbnail_variant(thumbnail_height, device_pixel_ratio)
+    encoded: bytes | None = cache.get(key, variant)
+    if encoded is not None:
+        thumbnail: QtGui.QImage = QtGui.QImage.fromData(encoded)
+        if not thumbnail.isNull():
+            thumbnail.setDevicePixelRatio(device_pixel_ratio)
+            return DecodedImage(key, thumbnail)
+    encoded = cache.get(key)
+    if encoded is None:
+        return None
+    thumbnail = make_thumbnail(QtGui.QImage.fromData(encoded), thumbnail_height,
+                               device_pixel_ratio)
+    cache.put(key, encode_png(thumbnail), variant)
+    return DecodedImage(key, thumbnail)
+
+
+def load_full(cache: ImageCache | None, key: str, data: str | bytes | None,
+              max_size: int) -> QtGui.QImage | None:
+    encoded: bytes | None = cache.get(key) if cache is not None else None
+    if encoded is None:
+        if data is None:
+            return None
+        encoded = _payload(data)
+        if cache is not None:
+            cache.put(key, encoded)
+    image: QtGui.QImage = decode_image(encoded, max_size)
+    return None if image.isNull() else image
+
+
+class DecodePipeline:
+    def __init__(self, max_workers: int | None = None, max_size: int = 2560,
+                 use_cache: bool = True, thumbnail_height: int = 90) -> None:
+        self.max_workers: int | None = max_workers
+        self.max_size: int = max_size
+        self.thumbnail_height: int = thumbnail_height
+        self.use_cache: bool = use_cache
+        self._executor: ThreadPoolExecutor | None = None
+        self._cache: ImageCache | None = None
+
+    @property
+    def cache(self) -> ImageCache | None:
+        if self.use_cache and self._cache is None:
+            self._cache = ImageCache()
+        return self._cache
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers,
+                                                thread_name_prefix='image-decode')
+        return self._executor
+
+    @staticmethod
+    def device_pixel_ratio() -> float:
+        app = QtGui.QGuiApplication.instance()
+        screen: QtGui.QScreen | None = QtGui.QGuiApplication.primaryScreen() if app else None
+        return screen.devicePixelRatio() if screen else 1.0
+
+    def digest(self, image: QtGui.QImage) -> asyncio.Future[str]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, image_digest, image)
+
+    def submit(self, data: str | bytes,
+               key: str | None = None) -> asyncio.Future[DecodedImage]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, decode_cached,
+                                    data, self.max_size, self.cache, key,
+                                    self.thumbnail_height,
+                                    self.device_pixel_ratio())
+
+    def load(self, key: str, data: str | bytes | None = None
+             ) -> asyncio.Future[QtGui.QImage | None]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, load_full, self.cache, key, data,
+                                    self.max_size)
+
+    def lookup(self, key: str) -> asyncio.Future[DecodedImage | None]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        cache: ImageCache | None = self.cache
+        if cache is None:
+            future: asyncio.Future[DecodedImage | None] = loop.create_future()
+            future.set_result(None)
+            return future
+        return loop.run_in_executor(self.executor, load_cached, cache, key,
+                                    self.thumbnail_height,
+                                    self.device_pixel_ratio())
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+decoder = DecodePipeline()
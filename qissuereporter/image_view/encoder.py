@@ -0,0 +1,78 @@
+import asyncio
+import base64
+import io
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6 import QtGui, QtCore
+
+
+def compress(image: QtGui.QImage, queality: int = 70) -> bytes:
+    from PIL import ImageQt
+    buffered = io.BytesIO()
+    img = ImageQt.fromqimage(image).convert('RGB')
+    img.save(buffered, optimize=True, format="JPEG", quality=queality)
+    return buffered.getvalue()
+
+
+def compress_b64(image: QtGui.QImage, quality: int = 70, scale: float = 1.0) -> str:
+    if scale < 1:
+        image = image.scaled(max(1, round(image.width() * scale)),
+                             max(1, round(image.height() * scale)),
+                             QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                             QtCore.Qt.TransformationMode.SmoothTransformation)
+    return base64.b64encode(compress(image, quality)).decode()
+
+
+async def fit_budget(encode: Callable[[int, float], Awaitable[str]], budget: int,
+                     min_quality: int = 10, max_quality: int = 95,
+                     min_scale: float = 0.25, scale_step: float = 0.75
+                     ) -> tuple[int, float, str]:
+    scale: float = 1.0
+    while True:
+        best: tuple[int, float, str] | None = None
+        result: str = await encode(max_quality, scale)
+        if len(result) <= budget:
+            return max_quality, scale, result
+        result = await encode(min_quality, scale)
+        if len(result) <= budget:
+            best = (min_quality, scale, result)
+            low: int = min_quality + 1
+            high: int = max_quality - 1
+            while low <= high:
+                quality: int = (low + high) // 2
+                result = await encode(quality, scale)
+                if len(result) <= budget:
+                    best = (quality, scale, result)
+                    low = quality + 1
+                else:
+                    high = quality - 1
+            return best
+        if scale * scale_step < min_scale:
+            return min_quality, scale, result
+        scale *= scale_step
+
+
+class EncodePipeline:
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers: int | None = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers,
+                                                thread_name_prefix='image-encode')
+        return self._executor
+
+    def submit(self, image: QtGui.QImage, quality: int,
+               scale: float = 1.0) -> asyncio.Future[str]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, compress_b64, image, quality, scale)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+encoder = EncodePipeline()
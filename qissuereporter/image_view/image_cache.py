@@ -0,0 +1,88 @@
+import hashlib
+import os
+import struct
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+from PyQt6 import QtGui
+from qissuereporter.utils import cache_dir
+
+
+_header = struct.Struct('<IIII')
+
+
+def image_digest(image: QtGui.QImage) -> str:
+    digest = hashlib.sha256(_header.pack(image.width(), image.height(),
+                                         image.bytesPerLine(), image.format().value))
+    bits = image.constBits()
+    if bits is not None:
+        digest.update(bits.asstring(image.sizeInBytes()))
+    return digest.hexdigest()
+
+
+class ImageCache:
+    def __init__(self, directory: Path | None = None,
+                 max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory: Path = directory or cache_dir() / 'images'
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes: int = max_bytes
+        self._lock = Lock()
+        self._size: int = sum(path.stat().st_size
+                              for path in self.directory.glob('*.img'))
+
+    def _path(self, key: str, variant: str) -> Path:
+        return self.directory / f'{key}-{variant}.img'
+
+    def get(self, key: str, variant: str = 'full') -> bytes | None:
+        path: Path = self._path(key, variant)
+        try:
+            data: bytes = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data or None
+
+    def put(self, key: str, data: bytes, variant: str = 'full') -> None:
+        if not data:
+            return
+        path: Path = self._path(key, variant)
+        temp: Path = path.with_suffix(f'.{uuid4().hex}.tmp')
+        try:
+            temp.write_bytes(data)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            try:
+                previous: int = path.stat().st_size if path.exists() else 0
+                os.replace(temp, path)
+            except OSError:
+                temp.unlink(missing_ok=True)
+                return
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob('*.img'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        target: int = self.max_bytes * 3 // 4
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.directory.glob('*.img'):
+                path.unlink(missing_ok=True)
+            self._size = 0
+
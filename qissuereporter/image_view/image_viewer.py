@@ -2,24 +2,126 @@ from PyQt6 import QtWidgets, QtGui, QtCore
 from qcustomwindow import CustomWindow
 
 
+class ImageCanvas(QtWidgets.QWidget):
+    def __init__(self, image: QtGui.QImage, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding,
+                           QtWidgets.QSizePolicy.Policy.MinimumExpanding)
+        self.setMouseTracking(True)
+        self.mipmaps: list[QtGui.QPixmap] = [QtGui.QPixmap.fromImage(image)]
+        self.zoom: float = 1.0
+        self.fit: bool = True
+        self.offset = QtCore.QPointF()
+        self.fast: bool = False
+        self._drag_start: QtCore.QPointF | None = None
+        self.settle_timer = QtCore.QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(150)
+        self.settle_timer.timeout.connect(self.settle)
+
+    @property
+    def image_size(self) -> QtCore.QSize:
+        return self.mipmaps[0].size()
+
+    def fit_zoom(self) -> float:
+        size: QtCore.QSize = self.image_size
+        if size.isEmpty():
+            return 1.0
+        return min(self.width() / size.width(), self.height() / size.height())
+
+    def scale(self) -> float:
+        return self.fit_zoom() if self.fit else self.zoom
+
+    def mipmap(self, scale: float) -> tuple[QtGui.QPixmap, float]:
+        level: int = 0
+        factor: float = 1.0
+        while scale * 2 <= factor and min(self.mipmaps[level].width(),
+                                         self.mipmaps[level].height()) > 1:
+            level += 1
+            factor /= 2
+            if level == len(self.mipmaps):
+                previous: QtGui.QPixmap = self.mipmaps[level - 1]
+                self.mipmaps.append(previous.scaled(
+                    max(1, previous.width() // 2), max(1, previous.height() // 2),
+                    QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                    QtCore.Qt.TransformationMode.SmoothTransformation))
+        return self.mipmaps[level], factor
+
+    def image_rect(self) -> QtCore.QRectF:
+        scale: float = self.scale()
+        size = QtCore.QSizeF(self.image_size) * scale
+        top_left = QtCore.QPointF((self.width() - size.width()) / 2,
+                                  (self.height() - size.height()) / 2)
+        if not self.fit:
+            top_left += self.offset
+        return QtCore.QRectF(top_left, size)
+
+    def paintEvent(self, a0) -> None:
+        painter = QtGui.QPainter(self)
+        target: QtCore.QRectF = self.image_rect()
+        visible: QtCore.QRectF = target.intersected(QtCore.QRectF(self.rect()))
+        if visible.isEmpty():
+            return
+        scale: float = self.scale()
+        pixmap, factor = self.mipmap(scale)
+        source = QtCore.QRectF((visible.left() - target.left()) / scale * factor,
+                               (visible.top() - target.top()) / scale * factor,
+                               visible.width() / scale * factor,
+                               visible.height() / scale * factor)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform,
+                              not self.fast)
+        painter.drawPixmap(visible, pixmap, source)
+
+    def resizeEvent(self, a0) -> None:
+        super().resizeEvent(a0)
+        self.fast = True
+        self.settle_timer.start()
+
+    def settle(self) -> None:
+        self.fast = False
+        self.update()
+
+    def wheelEvent(self, a0) -> None:
+        if a0 is None:
+            return
+        old_scale: float = self.scale()
+        steps: float = a0.angleDelta().y() / 120
+        new_scale: float = max(self.fit_zoom() / 4, min(old_scale * 1.25 ** steps, 16.0))
+        cursor: QtCore.QPointF = a0.position()
+        rect: QtCore.QRectF = self.image_rect()
+        image_point: QtCore.QPointF = (cursor - rect.topLeft()) / old_scale
+        self.fit = False
+        self.zoom = new_scale
+        centered: QtCore.QRectF = self.image_rect().translated(-self.offset)
+        self.offset = cursor - image_point * new_scale - centered.topLeft()
+        self.fast = True
+        self.settle_timer.start()
+        self.update()
+
+    def mousePressEvent(self, a0) -> None:
+        if a0 is not None and a0.button() == QtCore.Qt.MouseButton.LeftButton:
+            self._drag_start = a0.position() - self.offset
+
+    def mouseMoveEvent(self, a0) -> None:
+        if a0 is None or self._drag_start is None or self.fit:
+            return
+        self.offset = a0.position() - self._drag_start
+        self.fast = True
+        self.settle_timer.start()
+        self.update()
+
+    def mouseReleaseEvent(self, a0) -> None:
+        self._drag_start = None
+
+    def mouseDoubleClickEvent(self, a0) -> None:
+        self.fit = True
+        self.offset = QtCore.QPointF()
+        self.update()
+
+
 class ImageViewer(CustomWindow):
     def __init__(self, image: QtGui.QImage) -> None:
         super().__init__()
-        self.label = QtWidgets.QLabel(self)
-        self.label.setScaledContents(True)
-        self.label.setSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding,
-                                 QtWidgets.QSizePolicy.Policy.MinimumExpanding)
-        self.pix = QtGui.QPixmap.fromImage(image)
-        self.label.setPixmap(self.pix)
-        self.addWidget(self.label)
+        self.canvas = ImageCanvas(image, self)
+        self.addWidget(self.canvas)
         self.resize(image.size())
-
-    def resizeEvent(self, a0) -> None:
-        super().resizeEvent(a0)
-        self.label.resize(self.body.size())
-        pal: QtGui.QPalette = self.palette()
-        arm =  QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding
-        tm = QtCore.Qt.TransformationMode.SmoothTransformation
-        brush = QtGui.QBrush(self.pix.scaled(self.body.size(), arm, tm))
-        pal.setBrush(self.backgroundRole(), brush)
-        self.label.setPalette(pal)
@@ -1,30 +1,40 @@
-import base64
-from PyQt6 import QtWidgets, QtGui, QtCore
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+from loguru import logger
+from PyQt6 import QtWidgets, QtGui, QtCore, sip
 from qcustomwidgets import Button, ImageBox
-import io
-from PIL import ImageQt
 
-from qissuereporter.image_view.image_viewer import ImageViewer
+from qissuereporter.image_view.decoder import decoder, make_thumbnail
+from qissuereporter.image_view.encoder import compress_b64, encoder
 
-
-def compress(image: QtGui.QImage, queality: int = 70) -> bytes:
-    buffered = io.BytesIO()
-    img = ImageQt.fromqimage(image).convert('RGB')
-    img.save(buffered, optimize=True, format="JPEG", quality=queality)
-    return buffered.getvalue()
+if TYPE_CHECKING:
+    from qissuereporter.image_view.image_viewer import ImageViewer
 
 
 class Screenshot(Button):
     about_to_close = QtCore.pyqtSignal(QtWidgets.QWidget)
-    def __init__(self, image: QtGui.QImage, closable: bool = True) -> None:
-        super().__init__('', [ImageBox(image)], flat=False,
+    tile_height: int = 90
+    def __init__(self, image: QtGui.QImage | None, closable: bool = True,
+                 thumbnail: QtGui.QImage | None = None,
+                 loader: Callable[[], Awaitable[QtGui.QImage | None]] | None = None
+                 ) -> None:
+        if thumbnail is None:
+            thumbnail = make_thumbnail(image, self.tile_height,
+                                       decoder.device_pixel_ratio())
+        super().__init__('', [ImageBox(thumbnail)], flat=False,
                          full_size_image=True, side_margins=0)
-        self.source: QtGui.QImage = image
-        self.image_view = ImageViewer(self.source)
-        self.image = ImageBox(image)
-        self.imageb64: str = base64.b64encode(compress(self.source, 80)).decode()
-        self.setFixedHeight(90)
-        self.setMinimumWidth(90)
+        self.source: QtGui.QImage | None = image
+        self.loader: Callable[[], Awaitable[QtGui.QImage | None]] | None = loader
+        self._loading: asyncio.Task | None = None
+        self.image_view: 'ImageViewer | None' = None
+        self.quality: int = 80
+        self.scale: float = 1.0
+        self.digest: str = ''
+        self.encoded: dict[tuple[int, float], str] = {}
+        self._pending: dict[tuple[int, float], asyncio.Future[str]] = {}
+        self.setFixedHeight(self.tile_height)
+        self.setMinimumWidth(self.tile_height)
         if closable:
             self.close_btn = Button('', [':/svg/close'], self, True)
             self.close_btn.clicked.connect(self.close_button_clicked)
@@ -32,11 +42,66 @@ class Screenshot(Button):
         self.styleDict['default']['border-radius'] = 0
         self.styleDict['hover']['border-radius'] = 0
         self.styleDict['press']['border-radius'] = 0
-        self.clicked.connect(self.image_view.show)
+        self.clicked.connect(self.show_image_view)
+
+    def show_image_view(self):
+        if self.image_view is None:
+            if self.source is None:
+                if self.loader is not None and self._loading is None:
+                    self._loading = asyncio.ensure_future(self.load_source())
+                return
+            from qissuereporter.image_view.image_viewer import ImageViewer
+            self.image_view = ImageViewer(self.source)
+        self.image_view.show()
+
+    async def load_source(self):
+        try:
+            image: QtGui.QImage | None = await self.loader()
+        except Exception as err:
+            logger.error(err)
+            return
+        finally:
+            self._loading = None
+        if sip.isdeleted(self):
+            return
+        if image is None:
+            logger.error('Image is no longer available')
+            return
+        self.source = image
+        self.show_image_view()
 
     def close_button_clicked(self):
         self.about_to_close.emit(self)
         self.deleteLater()
 
-    def recompress(self, quality: int):
-        self.imageb64 = base64.b64encode(compress(self.source, quality)).decode()
+    @property
+    def imageb64(self) -> str:
+        key: tuple[int, float] = (self.quality, self.scale)
+        return self.encoded.get(key) or self.recompress(self.quality, self.scale)
+
+    def recompress(self, quality: int, scale: float = 1.0) -> str:
+        key: tuple[int, float] = (quality, scale)
+        if key not in self.encoded:
+            self.encoded[key] = compress_b64(self.source, quality, scale)
+        self.quality = quality
+        self.scale = scale
+        return self.encoded[key]
+
+    async def variant(self, quality: int, scale: float = 1.0) -> str:
+        key: tuple[int, float] = (quality, scale)
+        if key not in self.encoded:
+            future: asyncio.Future[str] | None = self._pending.get(key)
+            if future is None:
+                future = encoder.submit(self.source, quality, scale)
+                self._pending[key] = future
+            try:
+                self.encoded[key] = await asyncio.shield(future)
+            finally:
+                self._pending.pop(key, None)
+        return self.encoded[key]
+
+    async def encode(self, quality: int, scale: float = 1.0) -> str:
+        result: str = await self.variant(quality, scale)
+        self.quality = quality
+        self.scale = scale
+        return result
@@ -0,0 +1,63 @@
+import codecs
+import json
+import re
+from typing import Any
+
+
+_token_re: re.Pattern = re.compile(r'[\[\]{}"]')
+_string_re: re.Pattern = re.compile(r'["\\]')
+
+
+class JsonArrayStream:
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._pieces: list[str] = []
+        self._depth: int = 0
+        self._in_string: bool = False
+        self._escape: bool = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        text: str = self._decoder.decode(chunk)
+        items: list[Any] = []
+        start: int = 0 if self._depth >= 2 else -1
+        pos: int = 0
+        while True:
+            if self._escape:
+                if pos >= len(text):
+                    break
+                pos += 1
+                self._escape = False
+                continue
+            if self._in_string:
+                match = _string_re.search(text, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+            match = _token_re.search(text, pos)
+            if match is None:
+                break
+            token: str = match.group()
+            pos = match.end()
+            if token == '"':
+                self._in_string = True
+            elif token in '[{':
+                if self._depth == 0 and token != '[':
+                    raise ValueError('Expected a JSON array')
+                self._depth += 1
+                if self._depth == 2:
+                    start = match.start()
+            else:
+                self._depth -= 1
+                if self._depth == 1:
+                    self._pieces.append(text[start:pos])
+                    items.append(json.loads(''.join(self._pieces)))
+                    self._pieces.clear()
+                    start = -1
+        if start >= 0:
+            self._pieces.append(text[start:])
+        return items
@@ -3,6 +3,13 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+class AttachmentModel(BaseModel):
+    url: str
+    sha256: str
+    size: int = 0
+    content_type: str = 'image/jpeg'
+
+
 class BugReportModel(BaseModel):
     username: str = ''
     timestamp: str = Field(default_factory=lambda: datetime.now(UTC).isoformat(" ", 'seconds'))
@@ -13,6 +20,8 @@ class BugReportModel(BaseModel):
     details: str
     images: list[str]
     images_size: float
+    attachments: list[AttachmentModel] = Field(default_factory=lambda:[])
+    profiles: str = ''
 
     def query(self) -> dict[str, str]:
         report_type: dict[str, str] = {
@@ -26,11 +35,14 @@ class BugReportModel(BaseModel):
         content_model = ContentJSON(content=self.details,
                                     version=self.version,
                                     images=images,
+                                    attachments=self.attachments,
+                                    profiles=self.profiles,
                                     username=self.username)
         body: dict[str, str] = {
             'title': self.title,
             'type': report_type.get(self.report_type, 'Bug'),
-            'body': content_model.model_dump_json(indent=4),
+            'body': content_model.model_dump_json(
+                indent=4, exclude=None if self.profiles else {'profiles'}),
         }
         return body
 
@@ -46,6 +58,8 @@ class IssueBase(BaseModel):
 class ContentJSON(BaseModel):
     content: str
     images: list[str]
+    attachments: list[AttachmentModel] = Field(default_factory=lambda:[])
+    profiles: str = ''
     version: str
     username: str
 
@@ -59,9 +73,10 @@ class IssueContentModel(BaseModel):
     is_opened: bool
     content: str
     images: list[str] = Field(default_factory=lambda:[])
-    created_at: str
+    attachments: list[AttachmentModel] = Field(default_factory=lambda:[])
+    created_at: datetime
     issue_type: str
-    closed_at: str | None = None
+    closed_at: datetime | None = None
     close_reason: str | None = None
 
 
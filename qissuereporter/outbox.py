@@ -0,0 +1,192 @@
+import asyncio
+import os
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from uuid import uuid4
+import httpx
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+from qissuereporter.api import ApiSession, post_issue, retry_delay
+from qissuereporter.attachments import AttachmentBackend, upload_attachments
+from qissuereporter.models import BugReportModel
+from qissuereporter.utils import cache_dir, content_hash
+
+
+class OutboxEntry(BaseModel):
+    report: BugReportModel
+    url: str = ''
+    attempts: int = 0
+    next_attempt: float = 0
+    last_error: str = ''
+
+
+class Outbox:
+    def __init__(self, url: str, token: str, session: ApiSession | None = None,
+                 attachments: AttachmentBackend | None = None,
+                 directory: Path | None = None, concurrency: int = 3,
+                 base_delay: float = 2.0, max_delay: float = 3600.0,
+                 stale_after: float = 900.0) -> None:
+        self.url: str = url
+        self.token: str = token
+        self.session: ApiSession | None = session
+        self.attachments: AttachmentBackend | None = attachments
+        self.directory: Path = directory or \
+            cache_dir() / 'outbox' / content_hash(url.encode())[:16]
+        self.failed_directory: Path = self.directory / 'failed'
+        self.failed_directory.mkdir(parents=True, exist_ok=True)
+        self.concurrency: int = concurrency
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.stale_after: float = stale_after
+        self.on_delivered: Callable[[BugReportModel], None] | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._deliveries: set[asyncio.Task] = set()
+        self._claims: set[Path] = set()
+
+    def put(self, report: BugReportModel) -> Path:
+        path: Path = self.directory / f'{time.time_ns()}-{uuid4().hex}.json'
+        self._write(path, OutboxEntry(report=report, url=self.url))
+        self._wakeup.set()
+        return path
+
+    def pending(self) -> list[Path]:
+        return sorted(self.directory.glob('*.json'))
+
+    def _claim(self, path: Path) -> Path | None:
+        claimed: Path = path.with_suffix('.sending')
+        try:
+            os.replace(path, claimed)
+            os.utime(claimed)
+        except FileNotFoundError:
+            return None
+        self._claims.add(claimed)
+        return claimed
+
+    def _release(self, claimed: Path, entry: OutboxEntry) -> None:
+        self._write(claimed, entry)
+        os.replace(claimed, claimed.with_suffix('.json'))
+
+    def recover(self) -> float | None:
+        now: float = time.time()
+        next_expiry: float | None = None
+        for claimed in self.directory.glob('*.sending'):
+            if claimed in self._claims:
+                continue
+            try:
+                expiry: float = claimed.stat().st_mtime + self.stale_after
+                if expiry <= now:
+                    os.replace(claimed, claimed.with_suffix('.json'))
+                    continue
+            except FileNotFoundError:
+                continue
+            next_expiry = min(next_expiry or expiry, expiry)
+        return next_expiry
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        tasks: list[asyncio.Task] = list(self._deliveries)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            self._wakeup.clear()
+            next_due: float | None = self.recover()
+            now: float = time.time()
+            for path in self.pending():
+                entry: OutboxEntry | None = self._read(path)
+                if entry is None:
+                    continue
+                if entry.next_attempt > now:
+                    next_due = min(next_due or entry.next_attempt, entry.next_attempt)
+                    continue
+                claimed: Path | None = self._claim(path)
+                if claimed is None:
+                    continue
+                entry = self._read(claimed)
+                if entry is None:
+                    continue
+                task: asyncio.Task = asyncio.create_task(self._deliver(claimed, entry,
+                                                                       semaphore))
+                self._deliveries.add(task)
+                task.add_done_callback(lambda task, claimed=claimed:
+                                       self._delivery_done(task, claimed))
+            timeout: float | None = None if next_due is None else max(0.0, next_due - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _delivery_done(self, task: asyncio.Task, claimed: Path) -> None:
+        self._deliveries.discard(task)
+        self._claims.discard(claimed)
+        self._wakeup.set()
+
+    async def _deliver(self, path: Path, entry: OutboxEntry,
+                       semaphore: asyncio.Semaphore) -> None:
+        delay: float | None = None
+        url: str = entry.url or self.url
+        async with semaphore:
+            try:
+                os.utime(path)
+                if self.attachments is not None and entry.report.images:
+                    entry.report = await upload_attachments(entry.report, self.attachments)
+                    self._write(path, entry)
+                response: httpx.Response = await post_issue(url, self.token,
+                                                            entry.report.query(),
+                                                            self.session)
+            except asyncio.CancelledError:
+                self._release(path, entry)
+                raise
+            except Exception as err:
+                entry.last_error = str(err) or type(err).__name__
+            else:
+                if response.status_code == 201:
+                    path.unlink(missing_ok=True)
+                    if self.on_delivered is not None:
+                        self.on_delivered(entry.report)
+                    return
+                entry.last_error = f'{response.status_code} {response.reason_phrase}'
+                delay = retry_delay(response)
+                if delay is None and response.status_code in (400, 401, 404, 410, 422):
+                    logger.error(f'{url} {response.reason_phrase}{response.text}')
+                    os.replace(path, self.failed_directory / path.with_suffix('.json').name)
+                    return
+        entry.attempts += 1
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * 2 ** (entry.attempts - 1))
+            delay *= random.uniform(0.8, 1.2)
+        entry.next_attempt = time.time() + delay
+        logger.warning(f'Report "{entry.report.title}" not delivered '
+                       f'({entry.last_error}), retry in {delay:.0f} s')
+        self._release(path, entry)
+
+    def _read(self, path: Path) -> OutboxEntry | None:
+        try:
+            return OutboxEntry.model_validate_json(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as err:
+            logger.error(f'{path}: {err}')
+            try:
+                os.replace(path, self.failed_directory / path.with_suffix('.json').name)
+            except FileNotFoundError:
+                pass
+        return None
+
+    @staticmethod
+    def _write(path: Path, entry: OutboxEntry) -> None:
+        temp: Path = path.with_suffix('.tmp')
+        temp.write_text(entry.model_dump_json(), encoding='utf-8')
+        os.replace(temp, path)
@@ -0,0 +1,91 @@
+import asyncio
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+from qissuereporter.models import AttachmentModel, IssueContentModel
+
+
+image_str = '<img src="data:image/jpeg;base64,'
+
+
+class IssueTypeJSON(TypedDict):
+    name: str
+
+
+class RawIssue(TypedDict):
+    number: int
+    title: str
+    state: str
+    state_reason: str | None
+    type: IssueTypeJSON | None
+    created_at: str
+    closed_at: str | None
+    html_url: str
+    body: str | None
+
+
+class ContentRecord(TypedDict):
+    content: str
+    images: list[str]
+    attachments: NotRequired[list[AttachmentModel]]
+    version: str
+    username: str
+
+
+_content_adapter: TypeAdapter[ContentRecord] = TypeAdapter(ContentRecord)
+_issues_adapter: TypeAdapter[list[IssueContentModel]] = TypeAdapter(list[IssueContentModel])
+
+
+def image_payload(image: str) -> str:
+    if not image.startswith(image_str):
+        return image
+    return image[len(image_str):image.index('"', len(image_str))]
+
+
+def _fields(issue: RawIssue) -> dict:
+    body: str = issue['body'] or ''
+    issue_type: IssueTypeJSON | None = issue['type']
+    fields: dict = {
+        'number': issue['number'],
+        'url': issue['html_url'],
+        'is_opened': issue['state'] == 'open',
+        'title': issue['title'],
+        'created_at': issue['created_at'],
+        'issue_type': issue_type['name'] if issue_type else 'Bug',
+        'closed_at': issue['closed_at'],
+        'close_reason': issue['state_reason'],
+        'content': body,
+    }
+    if body.startswith('{'):
+        try:
+            fields.update(_content_adapter.validate_json(body))
+        except ValidationError:
+            pass
+    return fields
+
+
+def parse_issue(issue: dict) -> IssueContentModel:
+    try:
+        fields: dict = _fields(issue)
+    except (KeyError, TypeError, AttributeError) as err:
+        raise ValueError(f'Malformed issue: {err!r}') from err
+    return IssueContentModel.model_validate(fields)
+
+
+def parse_issues(issues: list[dict]) -> list[IssueContentModel]:
+    try:
+        return _issues_adapter.validate_python([_fields(issue) for issue in issues])
+    except (ValidationError, KeyError, TypeError, AttributeError):
+        pass
+    models: list[IssueContentModel] = []
+    for issue in issues:
+        try:
+            models.append(parse_issue(issue))
+        except ValueError as err:
+            number = issue.get('number', '?') if isinstance(issue, dict) else '?'
+            logger.error(f'Skipping malformed issue #{number}: {err}')
+    return models
+
+
+async def parse_issues_async(issues: list[dict]) -> list[IssueContentModel]:
+    return await asyncio.to_thread(parse_issues, issues)
@@ -0,0 +1,96 @@
+import heapq
+import math
+import re
+from collections import Counter
+from qissuereporter.models import IssueContentModel
+
+
+word_re: re.Pattern[str] = re.compile(r'\w{2,}')
+
+
+def terms(text: str) -> list[str]:
+    return word_re.findall(text.lower())
+
+
+class SimilarityIndex:
+    k1: float = 1.2
+    b: float = 0.75
+    title_weight: int = 3
+    max_df: float = 0.2
+
+    def __init__(self) -> None:
+        self.issues: dict[int, IssueContentModel] = {}
+        self.postings: dict[str, dict[int, int]] = {}
+        self.lengths: dict[int, int] = {}
+        self.total_length: int = 0
+        self._norms: dict[int, float] | None = None
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def document(self, issue: IssueContentModel) -> Counter[str]:
+        counts: Counter[str] = Counter(terms(issue.content))
+        for term in terms(issue.title):
+            counts[term] += self.title_weight
+        return counts
+
+    def add(self, issue: IssueContentModel) -> None:
+        old: IssueContentModel | None = self.issues.get(issue.number)
+        if old is not None:
+            if (old.title, old.content) == (issue.title, issue.content):
+                self.issues[issue.number] = issue
+                return
+            self.remove(issue.number)
+        counts: Counter[str] = self.document(issue)
+        self.issues[issue.number] = issue
+        self.lengths[issue.number] = sum(counts.values())
+        self.total_length += self.lengths[issue.number]
+        self._norms = None
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[issue.number] = count
+
+    def add_issues(self, issues: list[IssueContentModel]) -> None:
+        for issue in issues:
+            self.add(issue)
+
+    def remove(self, number: int) -> None:
+        issue: IssueContentModel | None = self.issues.pop(number, None)
+        if issue is None:
+            return
+        self.total_length -= self.lengths.pop(number)
+        self._norms = None
+        for term in self.document(issue):
+            posting: dict[int, int] = self.postings[term]
+            posting.pop(number, None)
+            if not posting:
+                del self.postings[term]
+
+    @property
+    def norms(self) -> dict[int, float]:
+        if self._norms is None:
+            average: float = self.total_length / len(self.issues) or 1.0
+            self._norms = {number: self.k1 * (1 - self.b + self.b * length / average)
+                           for number, length in self.lengths.items()}
+        return self._norms
+
+    def query(self, text: str, limit: int = 5,
+              min_score: float = 1.0) -> list[tuple[float, IssueContentModel]]:
+        amount: int = len(self.issues)
+        if not amount:
+            return []
+        norms: dict[int, float] = self.norms
+        scores: dict[int, float] = {}
+        for term, repeats in Counter(terms(text)).items():
+            posting: dict[int, int] | None = self.postings.get(term)
+            if not posting or len(posting) > self.max_df * amount > 1:
+                continue
+            idf: float = math.log(1 + (amount - len(posting) + 0.5) / (len(posting) + 0.5))
+            weight: float = repeats * idf * (self.k1 + 1)
+            for number, count in posting.items():
+                scores[number] = scores.get(number, 0.0) + \
+                    weight * count / (count + norms[number])
+        best: list[tuple[float, int]] = heapq.nlargest(limit, ((score, number)
+                                                              for number, score
+                                                              in scores.items()
+                                                              if score >= min_score))
+        return [(score, self.issues[number]) for score, number in best]
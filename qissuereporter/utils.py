@@ -1,5 +1,24 @@
+import hashlib
+import os
+import sys
 from pathlib import Path
 
 
 def exe_cwd() -> Path:
-    return Path(__file__).parent
\ No newline at end of file
+    return Path(__file__).parent
+
+
+def cache_dir() -> Path:
+    if sys.platform == 'win32':
+        base: Path = Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache'))
+    path: Path = base / 'qissuereporter'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,216 @@
+from functools import partial
+from typing import Any
+from PyQt6 import QtWidgets, QtGui, QtCore
+from qissuereporter.api import format_delta
+from qissuereporter.models import IssueContentModel
+from qissuereporter.viewer.timestamps import issue_moment, scheduler
+from qissuereporter.viewer.viewer_content import ContentWidget, issue_type_colors
+
+
+IssueRole: int = QtCore.Qt.ItemDataRole.UserRole + 1
+
+
+def subtitle(issue: IssueContentModel) -> str:
+    user_str: str = f' by {issue.username}' if issue.username else ''
+    version_str: str = f' (v{issue.version})' if issue.version else ''
+    delta: str = format_delta(issue_moment(issue))
+    if issue.is_opened:
+        return f'#{issue.number} opened {delta}{user_str}{version_str}'
+    return f'#{issue.number} closed {delta}{version_str}'
+
+
+class IssueListModel(QtCore.QAbstractListModel):
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.issues: list[IssueContentModel] = []
+        self.destroyed.connect(partial(self.unwatch_all, id(self), self.issues))
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.issues)
+
+    def data(self, index: QtCore.QModelIndex,
+             role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        issue: IssueContentModel = self.issues[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return issue.title
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return issue.url
+        if role == IssueRole:
+            return issue
+        return None
+
+    def watch(self, issue: IssueContentModel) -> None:
+        scheduler.register((id(self), issue.number), issue_moment(issue),
+                           partial(self.on_timestamp_changed, issue.number))
+
+    def unwatch(self, issue: IssueContentModel) -> None:
+        scheduler.unregister((id(self), issue.number))
+
+    @staticmethod
+    def unwatch_all(model_id: int, issues: list[IssueContentModel]) -> None:
+        for issue in issues:
+            scheduler.unregister((model_id, issue.number))
+
+    def on_timestamp_changed(self, number: int, _delta: str) -> None:
+        for row, issue in enumerate(self.issues):
+            if issue.number == number:
+                self.dataChanged.emit(self.index(row), self.index(row))
+                return
+
+    def set_issues(self, issues: list[IssueContentModel]) -> None:
+        self.beginResetModel()
+        for issue in self.issues:
+            self.unwatch(issue)
+        self.issues[:] = issues
+        for issue in self.issues:
+            self.watch(issue)
+        self.endResetModel()
+
+    def reconcile(self, issues: list[IssueContentModel]) -> None:
+        numbers: set[int] = {issue.number for issue in issues}
+        for row in reversed(range(len(self.issues))):
+            if self.issues[row].number not in numbers:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                self.unwatch(self.issues[row])
+                del self.issues[row]
+                self.endRemoveRows()
+        current: list[int] = [issue.number for issue in self.issues]
+        known: set[int] = set(current)
+        if [issue.number for issue in issues if issue.number in known] != current:
+            self.set_issues(issues)
+            return
+        for row, issue in enumerate(issues):
+            if row < len(self.issues) and self.issues[row].number == issue.number:
+                if self.issues[row] != issue:
+                    self.issues[row] = issue
+                    self.watch(issue)
+                    self.dataChanged.emit(self.index(row), self.index(row))
+                continue
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            self.issues.insert(row, issue)
+            self.watch(issue)
+            self.endInsertRows()
+
+    def append_issues(self, issues: list[IssueContentModel]) -> None:
+        if not issues:
+            return
+        first: int = len(self.issues)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(issues) - 1)
+        self.issues.extend(issues)
+        for issue in issues:
+            self.watch(issue)
+        self.endInsertRows()
+
+
+class IssueFilterModel(QtCore.QSortFilterProxyModel):
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.matches: set[int] | None = None
+
+    def set_matches(self, matches: set[int] | None) -> None:
+        if matches is None and self.matches is None:
+            return
+        self.matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int,
+                         source_parent: QtCore.QModelIndex) -> bool:
+        if self.matches is None:
+            return True
+        model = self.sourceModel()
+        if not isinstance(model, IssueListModel):
+            return True
+        return model.issues[source_row].number in self.matches
+
+
+class IssueDelegate(QtWidgets.QStyledItemDelegate):
+    row_height: int = 52
+    badge_width: int = 80
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem,
+                 index: QtCore.QModelIndex) -> QtCore.QSize:
+        return QtCore.QSize(option.rect.width(), self.row_height)
+
+    def paint(self, painter: QtGui.QPainter | None,
+              option: QtWidgets.QStyleOptionViewItem,
+              index: QtCore.QModelIndex) -> None:
+        issue: IssueContentModel | None = index.data(IssueRole)
+        if painter is None or issue is None:
+            return
+        painter.save()
+        rect: QtCore.QRect = option.rect.adjusted(4, 4, -4, -4)
+        if option.state & QtWidgets.QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        elif option.state & QtWidgets.QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(option.rect, option.palette.alternateBase())
+        color, background = issue_type_colors.get(issue.issue_type,
+                                                  issue_type_colors['Task'])
+        badge = QtCore.QRect(rect.left(), rect.top(), self.badge_width, rect.height())
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor(background))
+        painter.drawRoundedRect(badge, 6, 6)
+        painter.setPen(QtGui.QColor(color))
+        painter.drawText(badge, QtCore.Qt.AlignmentFlag.AlignCenter, issue.issue_type)
+
+        text_rect: QtCore.QRect = rect.adjusted(self.badge_width + 8, 0, 0, 0)
+        title_font = QtGui.QFont(option.font)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+        title_rect = QtCore.QRect(text_rect.left(), text_rect.top(),
+                                  text_rect.width(), text_rect.height() // 2)
+        title: str = QtGui.QFontMetrics(title_font).elidedText(
+            issue.title, QtCore.Qt.TextElideMode.ElideRight, title_rect.width())
+        painter.drawText(title_rect, QtCore.Qt.AlignmentFlag.AlignVCenter, title)
+
+        painter.setFont(option.font)
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.PlaceholderText))
+        sub_rect = QtCore.QRect(text_rect.left(), title_rect.bottom(),
+                                text_rect.width(), text_rect.height() - title_rect.height())
+        painter.drawText(sub_rect, QtCore.Qt.AlignmentFlag.AlignVCenter, subtitle(issue))
+        painter.restore()
+
+
+class IssueListView(QtWidgets.QSplitter):
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(QtCore.Qt.Orientation.Vertical, parent)
+        self.model = IssueListModel(self)
+        self.filter_model = IssueFilterModel(self)
+        self.filter_model.setSourceModel(self.model)
+        self.list_view = QtWidgets.QListView()
+        self.list_view.setModel(self.filter_model)
+        self.list_view.setItemDelegate(IssueDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.clicked.connect(self.on_clicked)
+        self.addWidget(self.list_view)
+        self.details: QtWidgets.QScrollArea | None = None
+
+    def on_clicked(self, index: QtCore.QModelIndex) -> None:
+        issue: IssueContentModel | None = index.data(IssueRole)
+        if issue is None:
+            return
+        if self.details is not None:
+            self.details.deleteLater()
+        self.details = QtWidgets.QScrollArea()
+        self.details.setWidgetResizable(True)
+        self.details.setWidget(ContentWidget(issue))
+        self.addWidget(self.details)
+
+    def set_filter(self, matches: set[int] | None) -> None:
+        self.filter_model.set_matches(matches)
+
+    def visible_count(self) -> int:
+        return self.filter_model.rowCount()
+
+    def clear(self) -> None:
+        self.model.set_issues([])
+        if self.details is not None:
+            self.details.deleteLater()
+            self.details = None
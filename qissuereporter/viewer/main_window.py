@@ -1,26 +1,44 @@
 import asyncio
-from pydantic import ValidationError
+from collections import ChainMap
+from collections.abc import AsyncIterator, MutableMapping
+import time
 import qasync
 import signal
 from qcustomwindow import CustomWindow
 from PyQt6 import QtWidgets, QtCore
 from qcustomwidgets import Button
 from qcustomwidgets.widgets.spinner import Spinner
+from loguru import logger
 from qissuereporter.viewer.viewer import Viewer
-from qissuereporter.models import BugReportModel, ContentJSON, IssueContentModel
-from qissuereporter.api import calc_delta, get_issues
-
-
-image_str = '<img src="data:image/jpeg;base64,'
+from qissuereporter.viewer.polling import PollScheduler, RefreshResult
+from qissuereporter.models import BugReportModel, IssueContentModel
+from qissuereporter.api import (ApiError, ApiSession, count_requests,
+                                iter_issue_batches, iter_issue_pages, iter_issues)
+from qissuereporter.parsing import parse_issues_async
+from qissuereporter.cache import IssueCache
+from qissuereporter.graphql import iter_issue_pages_graphql
 
 
 class ViewerWindow(CustomWindow):
     report_created = QtCore.pyqtSignal(BugReportModel)
-    def __init__(self, url: str, token: str) -> None:
+    issues_loaded = QtCore.pyqtSignal(list)
+    def __init__(self, url: str, token: str,
+                 session: ApiSession | None = None,
+                 cache: IssueCache | None = None,
+                 virtual: bool = False, streaming: bool = False,
+                 graphql: bool = False) -> None:
         super().__init__()
-        self.widget = Viewer()
+        self.widget = Viewer(virtual)
         self.url: str = url
         self.token: str = token
+        self.session: ApiSession = session or ApiSession()
+        self.cache: IssueCache = cache or IssueCache(url)
+        self.streaming: bool = streaming
+        self.graphql: bool = graphql
+        self.issues: dict[int, IssueContentModel] = {}
+        self._refresh_task: asyncio.Task[RefreshResult] | None = None
+        self._startup_task: asyncio.Task | None = None
+        self.poller = PollScheduler(self.refresh, self.session)
         self.setTitle('Issue Viewer')
         self.body_layout.addWidget(self.widget)
         self.timer = QtCore.QTimer()
@@ -33,55 +51,102 @@ class ViewerWindow(CustomWindow):
         self.add_left_widget(self.update_button)
 
     def startup(self):
-        asyncio.create_task(self.request_issues())
+        self._startup_task = asyncio.ensure_future(self.load_cache())
+        self._startup_task.add_done_callback(self.on_cache_loaded)
+
+    def on_cache_loaded(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error('Failed to load the issue cache')
+        self.poller.start()
+
+    async def load_cache(self):
+        issues: list[dict] = await self.cache.issues_async()
+        for model in await parse_issues_async(issues):
+            self.issues.setdefault(model.number, model)
+        if self.issues:
+            self.widget.update_issues(list(self.issues.values()))
+            self.issues_loaded.emit(list(self.issues.values()))
 
     @qasync.asyncSlot()
     async def _request_issues(self):
-        await self.request_issues()
+        result: RefreshResult = await self.refresh()
+        if result.error:
+            logger.error(result.error)
+
+    async def refresh(self) -> RefreshResult:
+        if self._refresh_task is None or self._refresh_task.done():
+            wait: float = self.session.retry_at - time.time()
+            if wait > 0:
+                return RefreshResult(False, 0, f'GitHub asked to wait {wait:.0f} s '
+                                               f'before the next request')
+            self._refresh_task = asyncio.create_task(self.request_issues())
+        return await asyncio.shield(self._refresh_task)
 
-    async def request_issues(self):
+    def showEvent(self, a0) -> None:
+        super().showEvent(a0)
+        self.poller.set_visible(not self.isMinimized())
+
+    def hideEvent(self, a0) -> None:
+        super().hideEvent(a0)
+        self.poller.set_visible(False)
+
+    def changeEvent(self, a0) -> None:
+        super().changeEvent(a0)
+        if a0 is not None and a0.type() == QtCore.QEvent.Type.WindowStateChange:
+            self.poller.set_visible(self.isVisible() and not self.isMinimized())
+
+    async def request_issues(self) -> RefreshResult:
         self.spinner.setVisible(True)
-        answer: list[dict] = await get_issues(self.url, self.token)
-        self.spinner.setVisible(False)
-        if answer:
-            models: list[IssueContentModel] = []
-            for issue in answer:
-                try:
-                    content_json: ContentJSON = ContentJSON.model_validate_json(issue['body'])
-                    images = [image[len(image_str):-17] for image in content_json.images]
-                    content = content_json.content
-                    username = content_json.username
-                    version = content_json.version
-                except ValidationError as err:
-                    images = []
-                    content = issue['body']
-                    username = ''
-                    version = ''
-                created_at: str = calc_delta(issue['created_at'])
-                if issue['closed_at']:
-                    closed_at: str = calc_delta(issue['closed_at'])
-                else:
-                    closed_at = issue['closed_at']
-                issue_type = issue['type']
-                if issue_type is None:
-                    issue_name: str = 'Bug'
-                else:
-                    issue_name = issue_type['name']
-                model = IssueContentModel(images=images,
-                                          number=issue['number'],
-                                          url=issue['html_url'],
-                                          is_opened=(issue['state'] == 'open'),
-                                          title=issue['title'],
-                                          version=version,
-                                          username=username,
-                                          content=content,
-                                          created_at=created_at,
-                                          issue_type=issue_name,
-                                          closed_at=closed_at,
-                                          close_reason=issue['state_reason'])
-                models.append(model)
-            self.widget.update_issues(models)
+        with count_requests() as count:
+            try:
+                changed: bool = await self.load_issues()
+            except ApiError as err:
+                return RefreshResult(False, count.responses, str(err))
+            finally:
+                self.spinner.setVisible(False)
+        return RefreshResult(changed, count.responses)
+
+    async def load_issues(self) -> bool:
+        since: str | None = self.cache.last_updated()
+        staged: dict[str, str] = {}
+        etags: MutableMapping[str, str] = ChainMap(staged, self.cache.etags)
+        raw: list[dict] = []
+        loaded: list[IssueContentModel] = []
+        pages: int = 0
+        async for page in self.iter_pages(since, etags):
+            models: list[IssueContentModel] = await parse_issues_async(page)
+            if since is None and not pages:
+                self.widget.clear_issues()
+                self.issues.clear()
+            pages += 1
+            raw.extend(page)
+            loaded.extend(models)
+            self.issues_loaded.emit(models)
+            if since is None:
+                for model in models:
+                    self.issues[model.number] = model
+                self.widget.add_issues(models)
+        self.cache.upsert(raw, staged)
+        changed: bool = bool(raw)
+        if since is not None and changed:
+            for model in loaded:
+                self.issues[model.number] = model
+            self.widget.update_issues(sorted(self.issues.values(),
+                                             key=lambda model: -model.number))
+        return changed
 
+    def iter_pages(self, since: str | None,
+                   etags: MutableMapping[str, str]) -> AsyncIterator[list[dict]]:
+        if self.graphql:
+            return iter_issue_pages_graphql(self.url, self.token,
+                                            session=self.session, since=since)
+        if self.streaming:
+            issues: AsyncIterator[dict] = iter_issues(self.url, self.token,
+                                                      session=self.session,
+                                                      since=since, etags=etags)
+            return iter_issue_batches(issues)
+        return iter_issue_pages(self.url, self.token, session=self.session,
+                                since=since, etags=etags)
 
 if __name__ == '__main__':
     from qasync import QEventLoop
@@ -95,3 +160,5 @@ if __name__ == '__main__':
     w.show()
     with event_loop:
         event_loop.run_until_complete(app_close_event.wait())
+        event_loop.run_until_complete(w.poller.stop())
+        event_loop.run_until_complete(w.session.aclose())
@@ -0,0 +1,102 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+from loguru import logger
+from qissuereporter.api import ApiSession
+
+
+class RefreshResult(NamedTuple):
+    changed: bool
+    requests: int
+    error: str = ''
+
+
+class PollScheduler:
+    def __init__(self, refresh: Callable[[], Awaitable[RefreshResult]], session: ApiSession,
+                 min_interval: float = 60.0, max_interval: float = 900.0,
+                 hidden_factor: float = 4.0, max_backoff: float = 3600.0,
+                 reserve: int = 100) -> None:
+        self.refresh: Callable[[], Awaitable[RefreshResult]] = refresh
+        self.session: ApiSession = session
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.hidden_factor: float = hidden_factor
+        self.max_backoff: float = max_backoff
+        self.reserve: int = reserve
+        self.interval: float = min_interval
+        self.errors: int = 0
+        self.visible: bool = True
+        self.requests_per_poll: int = 1
+        self.last_poll: float = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def set_visible(self, visible: bool) -> None:
+        if visible == self.visible:
+            return
+        self.visible = visible
+        self._wakeup.set()
+
+    def next_delay(self) -> float:
+        delay: float = self.interval
+        if not self.visible:
+            delay *= self.hidden_factor
+        if self.errors:
+            delay = max(delay, min(self.max_backoff, self.min_interval * 2 ** self.errors))
+        now: float = time.time()
+        session: ApiSession = self.session
+        if session.retry_at > now:
+            delay = max(delay, session.retry_at - now)
+        if session.rate_remaining is not None and session.rate_reset is not None \
+                and session.rate_reset > now:
+            budget: int = session.rate_remaining - self.reserve
+            window: float = session.rate_reset - now
+            if budget < self.requests_per_poll:
+                delay = max(delay, window)
+            else:
+                delay = max(delay, window * self.requests_per_poll / budget)
+        return delay
+
+    async def run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            timeout: float = self.last_poll + self.next_delay() - time.time()
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    continue
+                except TimeoutError:
+                    pass
+            await self.poll()
+
+    async def poll(self) -> RefreshResult:
+        try:
+            result: RefreshResult = await self.refresh()
+        except Exception as err:
+            result = RefreshResult(False, 0, str(err) or type(err).__name__)
+        self.last_poll = time.time()
+        if result.error or not result.requests:
+            self.errors += 1
+            logger.warning(f'Issue refresh failed {self.errors} time(s) in a row '
+                           f'({result.error or "no requests made"}), '
+                           f'next attempt in {self.next_delay():.0f} s')
+            return result
+        self.errors = 0
+        self.requests_per_poll = result.requests
+        interval: float = self.interval / 2 if result.changed else self.interval * 1.5
+        interval *= random.uniform(0.9, 1.1)
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        return result
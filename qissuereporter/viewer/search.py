@@ -0,0 +1,114 @@
+import re
+from bisect import bisect_left, insort
+from qissuereporter.models import IssueContentModel
+
+
+word_re: re.Pattern[str] = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> set[str]:
+    return set(word_re.findall(text.lower()))
+
+
+class IssueIndex:
+    fields: tuple[str, ...] = ('type', 'version', 'user')
+
+    def __init__(self) -> None:
+        self.issues: dict[int, IssueContentModel] = {}
+        self.postings: dict[str, set[int]] = {}
+        self.terms: list[str] = []
+        self.documents: dict[int, set[str]] = {}
+        self.filters: dict[str, dict[str, set[int]]] = {field: {} for field in self.fields}
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    @staticmethod
+    def field_values(issue: IssueContentModel) -> dict[str, str]:
+        return {'type': issue.issue_type.lower(),
+                'version': issue.version.lower(),
+                'user': issue.username.lower()}
+
+    def add(self, issue: IssueContentModel) -> None:
+        old: IssueContentModel | None = self.issues.get(issue.number)
+        if old is not None:
+            if old == issue:
+                return
+            self.remove(issue.number)
+        self.issues[issue.number] = issue
+        tokens: set[str] = tokenize(' '.join((issue.title, issue.content, issue.username,
+                                              issue.version, issue.issue_type)))
+        tokens.add(str(issue.number))
+        self.documents[issue.number] = tokens
+        for token in tokens:
+            posting: set[int] | None = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = set()
+                insort(self.terms, token)
+            posting.add(issue.number)
+        for field, value in self.field_values(issue).items():
+            self.filters[field].setdefault(value, set()).add(issue.number)
+
+    def add_issues(self, issues: list[IssueContentModel]) -> None:
+        for issue in issues:
+            self.add(issue)
+
+    def remove(self, number: int) -> None:
+        issue: IssueContentModel | None = self.issues.pop(number, None)
+        if issue is None:
+            return
+        for token in self.documents.pop(number):
+            posting: set[int] = self.postings[token]
+            posting.discard(number)
+            if not posting:
+                del self.postings[token]
+                del self.terms[bisect_left(self.terms, token)]
+        for field, value in self.field_values(issue).items():
+            values: dict[str, set[int]] = self.filters[field]
+            values[value].discard(number)
+            if not values[value]:
+                del values[value]
+
+    def clear(self) -> None:
+        self.issues.clear()
+        self.postings.clear()
+        self.terms.clear()
+        self.documents.clear()
+        for values in self.filters.values():
+            values.clear()
+
+    def prefix(self, prefix: str) -> set[int]:
+        exact: set[int] | None = self.postings.get(prefix)
+        result: set[int] = set(exact) if exact else set()
+        index: int = bisect_left(self.terms, prefix)
+        if exact:
+            index += 1
+        while index < len(self.terms) and self.terms[index].startswith(prefix):
+            result |= self.postings[self.terms[index]]
+            index += 1
+        return result
+
+    def field(self, field: str, value: str) -> set[int]:
+        values: dict[str, set[int]] = self.filters[field]
+        if field == 'type':
+            return set(values.get(value, ()))
+        result: set[int] = set()
+        for key, numbers in values.items():
+            if key.startswith(value):
+                result |= numbers
+        return result
+
+    def search(self, query: str) -> set[int] | None:
+        result: set[int] | None = None
+        for part in query.lower().split():
+            field, sep, value = part.partition(':')
+            if sep and field in self.filters:
+                matches: set[int] = self.field(field, value) if value else set(self.issues)
+                result = matches if result is None else result & matches
+            else:
+                for token in word_re.findall(part):
+                    matches = self.prefix(token)
+                    result = matches if result is None else result & matches
+            if result is not None and not result:
+                return result
+        return result
@@ -0,0 +1,85 @@
+import heapq
+import math
+import time
+from collections.abc import Callable, Hashable
+from datetime import UTC, datetime
+from itertools import count
+from PyQt6 import QtCore
+from qissuereporter.api import format_delta, next_change
+from qissuereporter.models import IssueContentModel
+
+
+def issue_moment(issue: IssueContentModel) -> datetime:
+    if issue.is_opened or issue.closed_at is None:
+        return issue.created_at
+    return issue.closed_at
+
+
+class TimestampScheduler:
+    def __init__(self) -> None:
+        self.heap: list[tuple[int, int, Hashable]] = []
+        self.entries: dict[Hashable, tuple[int, datetime, str, Callable[[str], None]]] = {}
+        self._seq = count()
+        self._timer: QtCore.QTimer | None = None
+
+    @property
+    def timer(self) -> QtCore.QTimer:
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.fire)
+        return self._timer
+
+    def register(self, key: Hashable, moment: datetime,
+                 callback: Callable[[str], None]) -> str:
+        now: datetime = datetime.now(UTC)
+        text: str = format_delta(moment, now)
+        seq: int = next(self._seq)
+        self.entries[key] = (seq, moment, text, callback)
+        self._push(seq, key, now.timestamp() + next_change(moment, now))
+        return text
+
+    def unregister(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+        if not self.entries:
+            self.heap.clear()
+            if self._timer is not None:
+                self._timer.stop()
+
+    def _push(self, seq: int, key: Hashable, due: float) -> None:
+        heapq.heappush(self.heap, (math.ceil(due), seq, key))
+        if self.heap[0][1] == seq:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        while self.heap and self.entries.get(self.heap[0][2], (None,))[0] != self.heap[0][1]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return
+        delay: float = self.heap[0][0] - time.time()
+        self.timer.start(max(0, math.ceil(delay * 1000)))
+
+    def fire(self) -> None:
+        now: datetime = datetime.now(UTC)
+        timestamp: float = now.timestamp()
+        while self.heap and self.heap[0][0] <= timestamp:
+            _, seq, key = heapq.heappop(self.heap)
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != seq:
+                continue
+            _, moment, text, callback = entry
+            new_text: str = format_delta(moment, now)
+            if new_text != text:
+                try:
+                    callback(new_text)
+                except RuntimeError:
+                    # the label's C++ object is already gone
+                    del self.entries[key]
+                    continue
+            self.entries[key] = (seq, moment, new_text, callback)
+            heapq.heappush(self.heap, (math.ceil(timestamp + next_change(moment, now)),
+                                       seq, key))
+        self._schedule()
+
+
+scheduler = TimestampScheduler()
@@ -1,20 +1,64 @@
 import asyncio
 from pathlib import Path
 import signal
-from PyQt6 import QtWidgets
-from PyQt6.uic.load_ui import loadUi
+from PyQt6 import QtWidgets, QtCore
+from PyQt6.uic.load_ui import loadUiType
 from qissuereporter.models import IssueContentModel
 from qissuereporter.viewer.viewer_content import ContentWidget
+from qissuereporter.viewer.issue_list import IssueListView
+from qissuereporter.viewer.search import IssueIndex
 
 
-class Viewer(QtWidgets.QWidget):
+ViewerForm, _ = loadUiType(str(Path(__file__).parent / 'viewer.ui'))
+
+
+class Viewer(QtWidgets.QWidget, ViewerForm):
     tab_widget: QtWidgets.QTabWidget
+    search_line_edit: QtWidgets.QLineEdit
     opened_issues_vlayout: QtWidgets.QVBoxLayout
     closed_issues_vlayout: QtWidgets.QVBoxLayout
-    def __init__(self):
+    scrollArea: QtWidgets.QScrollArea
+    scrollArea_2: QtWidgets.QScrollArea
+    def __init__(self, virtual: bool = False):
         super().__init__()
-        loadUi(Path(__file__).parent / 'viewer.ui', self)
-        self.widgets: list[ContentWidget] = []
+        self.setupUi(self)
+        self.virtual: bool = virtual
+        self.lists: list[IssueListView] = []
+        if virtual:
+            for index in range(2):
+                tab: QtWidgets.QWidget | None = self.tab_widget.widget(index)
+                if tab is None or (tab_layout := tab.layout()) is None:
+                    continue
+                scroll_area = tab.findChild(QtWidgets.QScrollArea)
+                if scroll_area is not None:
+                    scroll_area.hide()
+                issue_list = IssueListView()
+                tab_layout.addWidget(issue_list)
+                self.lists.append(issue_list)
+        self.widgets: dict[int, ContentWidget] = {}
+        self.scroll_areas: list[QtWidgets.QScrollArea] = [self.scrollArea,
+                                                          self.scrollArea_2]
+        self.prefetch_batch: int = 5
+        self.prefetch_timer = QtCore.QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(100)
+        self.prefetch_timer.timeout.connect(self.prefetch_visible)
+        for scroll_area in self.scroll_areas:
+            scroll_bar: QtWidgets.QScrollBar | None = scroll_area.verticalScrollBar()
+            if scroll_bar:
+                scroll_bar.valueChanged.connect(self.prefetch_timer.start)
+        self.tab_widget.currentChanged.connect(self.prefetch_timer.start)
+        self.index = IssueIndex()
+        self.matches: set[int] | None = None
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(100)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_line_edit.textChanged.connect(self.search_timer.start)
+        self.opened_amount: int = 0
+        self.closed_amount: int = 0
+        self.opened_visible: int = 0
+        self.closed_visible: int = 0
         policy = QtWidgets.QSizePolicy.Policy.Expanding
         self.spacers: list[QtWidgets.QSpacerItem] = [
             QtWidgets.QSpacerItem(1, 1, vPolicy=policy),
@@ -24,29 +68,149 @@ class Viewer(QtWidgets.QWidget):
         self.closed_issues_vlayout.addItem(self.spacers[1])
 
     def update_issues(self, issues: list[IssueContentModel]):
+        opened: list[IssueContentModel] = [issue for issue in issues
+                                           if issue.is_opened]
+        closed: list[IssueContentModel] = [issue for issue in issues
+                                           if not issue.is_opened]
+        self.opened_amount = len(opened)
+        self.closed_amount = len(closed)
+        numbers: set[int] = {issue.number for issue in issues}
+        for number in [number for number in self.index.issues if number not in numbers]:
+            self.index.remove(number)
+        self.index.add_issues(issues)
+        if self.virtual:
+            self.lists[0].model.reconcile(opened)
+            self.lists[1].model.reconcile(closed)
+            self.apply_filter()
+            return
+        for number in [number for number in self.widgets if number not in numbers]:
+            self.remove_widget(self.widgets.pop(number))
         self.opened_issues_vlayout.removeItem(self.spacers[0])
         self.closed_issues_vlayout.removeItem(self.spacers[1])
-        for widget in self.widgets:
-            widget.deleteLater()
+        self.arrange(self.opened_issues_vlayout, [self.issue_widget(issue)
+                                                  for issue in opened])
+        self.arrange(self.closed_issues_vlayout, [self.issue_widget(issue)
+                                                  for issue in closed])
+        self.opened_issues_vlayout.addItem(self.spacers[0])
+        self.closed_issues_vlayout.addItem(self.spacers[1])
+        self.apply_filter()
+
+    def issue_widget(self, issue: IssueContentModel) -> ContentWidget:
+        widget: ContentWidget | None = self.widgets.get(issue.number)
+        if widget is None:
+            widget = ContentWidget(issue, folded=True)
+            self.widgets[issue.number] = widget
+        else:
+            widget.update_data(issue)
+        return widget
+
+    def arrange(self, layout: QtWidgets.QVBoxLayout, widgets: list[ContentWidget]):
+        for index, widget in enumerate(widgets):
+            item: QtWidgets.QLayoutItem | None = layout.itemAt(index)
+            if item is not None and item.widget() is widget:
+                continue
+            self.opened_issues_vlayout.removeWidget(widget)
+            self.closed_issues_vlayout.removeWidget(widget)
+            layout.insertWidget(index, widget)
+
+    def remove_widget(self, widget: ContentWidget):
+        self.opened_issues_vlayout.removeWidget(widget)
+        self.closed_issues_vlayout.removeWidget(widget)
+        widget.deleteLater()
+
+    def clear_issues(self):
+        for issue_list in self.lists:
+            issue_list.clear()
+        for widget in self.widgets.values():
+            self.remove_widget(widget)
         self.widgets.clear()
-        opened_amount = 0
-        closed_amount = 0
+        self.index.clear()
+        self.opened_amount = 0
+        self.closed_amount = 0
+        self.apply_filter()
+
+    def add_issues(self, issues: list[IssueContentModel]):
+        self.index.add_issues(issues)
+        if self.virtual:
+            opened: list[IssueContentModel] = [issue for issue in issues
+                                               if issue.is_opened]
+            closed: list[IssueContentModel] = [issue for issue in issues
+                                               if not issue.is_opened]
+            self.lists[0].model.append_issues(opened)
+            self.lists[1].model.append_issues(closed)
+            self.opened_amount += len(opened)
+            self.closed_amount += len(closed)
+            self.apply_filter()
+            return
+        self.opened_issues_vlayout.removeItem(self.spacers[0])
+        self.closed_issues_vlayout.removeItem(self.spacers[1])
         for issue in issues:
-            issue_widget = ContentWidget(issue)
-            self.widgets.append(issue_widget)
+            if issue.number in self.widgets:
+                continue
+            issue_widget = ContentWidget(issue, folded=True)
+            self.widgets[issue.number] = issue_widget
             if issue.is_opened:
-                opened_amount += 1
+                self.opened_amount += 1
                 self.opened_issues_vlayout.addWidget(issue_widget)
             else:
-                closed_amount += 1
+                self.closed_amount += 1
                 self.closed_issues_vlayout.addWidget(issue_widget)
-            issue_widget.fold_button.click()
-        tab_bar = self.tab_widget.tabBar()
-        if tab_bar:
-            tab_bar.setTabText(0, f'Open ({opened_amount})')
-            tab_bar.setTabText(1, f'Closed ({closed_amount})')
         self.opened_issues_vlayout.addItem(self.spacers[0])
         self.closed_issues_vlayout.addItem(self.spacers[1])
+        self.apply_filter()
+
+    def apply_filter(self):
+        self.matches = self.index.search(self.search_line_edit.text())
+        if self.virtual:
+            for issue_list in self.lists:
+                issue_list.set_filter(self.matches)
+            self.opened_visible = self.lists[0].visible_count()
+            self.closed_visible = self.lists[1].visible_count()
+        else:
+            self.opened_visible = 0
+            self.closed_visible = 0
+            for number, widget in self.widgets.items():
+                visible: bool = self.matches is None or number in self.matches
+                widget.setHidden(not visible)
+                if not visible:
+                    continue
+                if widget.data.is_opened:
+                    self.opened_visible += 1
+                else:
+                    self.closed_visible += 1
+            self.prefetch_timer.start()
+        self.update_tab_titles()
+
+    def prefetch_visible(self):
+        scroll_area: QtWidgets.QScrollArea = self.scroll_areas[self.tab_widget.currentIndex()]
+        viewport: QtWidgets.QWidget | None = scroll_area.viewport()
+        if viewport is None:
+            return
+        margin: int = viewport.height()
+        visible = viewport.rect().adjusted(0, -margin, 0, margin)
+        loaded: int = 0
+        for widget in self.widgets.values():
+            if widget.details_loaded or widget.isHidden() \
+                    or not scroll_area.isAncestorOf(widget):
+                continue
+            top_left: QtCore.QPoint = widget.mapTo(viewport, QtCore.QPoint(0, 0))
+            if visible.intersects(QtCore.QRect(top_left, widget.size())):
+                widget.load_details()
+                loaded += 1
+                if loaded >= self.prefetch_batch:
+                    self.prefetch_timer.start()
+                    return
+
+    def update_tab_titles(self):
+        tab_bar = self.tab_widget.tabBar()
+        if not tab_bar:
+            return
+        if self.matches is None:
+            tab_bar.setTabText(0, f'Open ({self.opened_amount})')
+            tab_bar.setTabText(1, f'Closed ({self.closed_amount})')
+        else:
+            tab_bar.setTabText(0, f'Open ({self.opened_visible}/{self.opened_amount})')
+            tab_bar.setTabText(1, f'Closed ({self.closed_visible}/{self.closed_amount})')
 
 
 if __name__ == '__main__':
@@ -1,14 +1,29 @@
-import base64
-import json
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
 from pathlib import Path
+from loguru import logger
 from qcustomwidgets import Button
-from PyQt6 import QtWidgets, QtGui, QtCore
-from PyQt6.uic.load_ui import loadUi
+from PyQt6 import QtWidgets, QtGui, QtCore, sip
+from PyQt6.uic.load_ui import loadUiType
 from qissuereporter.creator.report_widget import Screenshot
-from qissuereporter.models import ContentJSON, IssueContentModel
+from qissuereporter.image_view.decoder import DecodedImage, decoder
+from qissuereporter.attachments import fetch_attachment
+from qissuereporter.models import AttachmentModel, IssueContentModel
+from qissuereporter.viewer.timestamps import issue_moment, scheduler
 
 
-class ContentWidget(QtWidgets.QWidget):
+issue_type_colors: dict[str, tuple[str, str]] = {
+    'Bug': ("#e5534b", "#352c33"),
+    'Feature': ("#478be6", "#253142"),
+    'Task': ("#c68f27", "#36342c"),
+}
+
+
+ContentForm, _ = loadUiType(str(Path(__file__).parent / 'viewer_content.ui'))
+
+
+class ContentWidget(QtWidgets.QWidget, ContentForm):
     text_browser: QtWidgets.QTextBrowser
     dt_label: QtWidgets.QLabel
     title_button: QtWidgets.QPushButton
@@ -18,29 +33,24 @@ class ContentWidget(QtWidgets.QWidget):
     main_layout: QtWidgets.QVBoxLayout
     scroll_area: QtWidgets.QScrollArea
 
-    def __init__(self, data: IssueContentModel) -> None:
+    def __init__(self, data: IssueContentModel, folded: bool = False) -> None:
         super().__init__()
-        loadUi(Path(__file__).parent / 'viewer_content.ui', self)
-        self.number_label.setText(f'#{data.number}')
-        self.title_button.setText(f' {data.title}')
-        user_str: str = f' by {data.username}' if data.username else ''
-        version_str = f' (v{data.version})' if data.version else ''
-        self.text_browser.setMarkdown(data.content)
-        if data.is_opened:
-            self.dt_label.setText(f'opened {data.created_at}{user_str}{version_str}')
-        else:
-            self.dt_label.setText(f'closed {data.closed_at} {version_str}')
-            icon = QtGui.QIcon(':/svg/issue-closed')
-            self.title_button.setIcon(icon)
+        self.setupUi(self)
+        self.data: IssueContentModel = data
         self.url: str = data.url
+        self._content: str = data.content
         self._images: list[str] = data.images
+        self._attachments: list[AttachmentModel] = data.attachments
+        self.details_loaded: bool = False
+        self._decode_futures: list[asyncio.Future[DecodedImage]] = []
+        self.destroyed.connect(partial(self.cancel_decoding, self._decode_futures))
+        self.destroyed.connect(partial(scheduler.unregister, id(self)))
         self.images_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.issue_type = Button(data.issue_type)
-        self.set_issue_type_style(data.issue_type)
         self.issue_type.clicked.connect(self.issue_clicked)
         self.issue_type.setMaximumWidth(100)
         self.horizontal_layout.insertWidget(0, self.issue_type)
-
+        self.set_header(data)
 
         self.fold_button = Button('', [':/svg/arrow-up-small',
                                        ':/svg/arrow-down-small'],
@@ -48,25 +58,126 @@ class ContentWidget(QtWidgets.QWidget):
         self.title_button.clicked.connect(self.fold_button.click)
         self.fold_button.clicked.connect(self.on_fold)
         self.horizontal_layout.addWidget(self.fold_button, 1)
-        if not data.images:
-            self.scroll_area.deleteLater()
+        if not self.has_images:
+            self.scroll_area.hide()
+        if folded:
+            self.fold_button.click()
         else:
-            for img in data.images:
-                raw_image: bytes = base64.b64decode(img)
-                image: QtGui.QImage = QtGui.QImage.fromData(raw_image)
-                image_box = Screenshot(image, False)
-                self.images_layout.addWidget(image_box)
+            self.load_details()
 
-    def set_issue_type_style(self, issue_type: str):
-        if issue_type == 'Bug':
-            color = "#e5534b"
-            background = "#352c33"
-        elif issue_type == 'Feature':
-            color = "#478be6"
-            background = "#253142"
+    def set_header(self, data: IssueContentModel):
+        self.number_label.setText(f'#{data.number}')
+        self.title_button.setText(f' {data.title}')
+        if data.is_opened:
+            self.title_button.setIcon(QtGui.QIcon(':/svg/issue-opened'))
         else:
-            color = "#c68f27"
-            background = "#36342c"
+            self.title_button.setIcon(QtGui.QIcon(':/svg/issue-closed'))
+        self.refresh_timestamp(scheduler.register(id(self), issue_moment(data),
+                                                  self.refresh_timestamp))
+        self.url = data.url
+        self.issue_type.setText(data.issue_type)
+        self.set_issue_type_style(data.issue_type)
+
+    def refresh_timestamp(self, delta: str):
+        data: IssueContentModel = self.data
+        version_str = f' (v{data.version})' if data.version else ''
+        if data.is_opened:
+            user_str: str = f' by {data.username}' if data.username else ''
+            self.dt_label.setText(f'opened {delta}{user_str}{version_str}')
+        else:
+            self.dt_label.setText(f'closed {delta} {version_str}')
+
+    def update_data(self, data: IssueContentModel):
+        old: IssueContentModel = self.data
+        if data == old:
+            return
+        self.data = data
+        self.set_header(data)
+        if (data.content, data.images, data.attachments) == (old.content, old.images,
+                                                             old.attachments):
+            return
+        self._content = data.content
+        self._images = data.images
+        self._attachments = data.attachments
+        if not self.details_loaded:
+            return
+        self.cancel_decoding(self._decode_futures)
+        self._decode_futures.clear()
+        while (item := self.images_layout.takeAt(0)) is not None:
+            if (widget := item.widget()) is not None:
+                widget.deleteLater()
+        self.details_loaded = False
+        if not self.text_browser.isHidden():
+            self.load_details()
+            self.scroll_area.setVisible(self.has_images)
+
+    def load_details(self):
+        if self.details_loaded:
+            return
+        self.details_loaded = True
+        self.text_browser.setMarkdown(self._content)
+        for img in self._images:
+            self.add_image_future(decoder.submit(img), partial(decoder.load, data=img))
+        for attachment in self._attachments:
+            self.add_image_future(asyncio.ensure_future(self.load_attachment(attachment)),
+                                  partial(self.load_attachment_image, attachment))
+
+    @property
+    def has_images(self) -> bool:
+        return bool(self._images or self._attachments)
+
+    def add_image_future(self, future: asyncio.Future[DecodedImage],
+                         loader: Callable[[str], Awaitable[QtGui.QImage | None]]):
+        placeholder = QtWidgets.QLabel('Loading...')
+        placeholder.setFixedSize(90, 90)
+        placeholder.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.images_layout.addWidget(placeholder)
+        future.add_done_callback(partial(self.on_image_decoded, placeholder, loader))
+        self._decode_futures.append(future)
+
+    @staticmethod
+    async def load_attachment(attachment: AttachmentModel) -> DecodedImage:
+        image: DecodedImage | None = await decoder.lookup(attachment.sha256)
+        if image is not None:
+            return image
+        data: bytes = await fetch_attachment(attachment)
+        return await decoder.submit(data, attachment.sha256)
+
+    @staticmethod
+    async def load_attachment_image(attachment: AttachmentModel,
+                                    key: str) -> QtGui.QImage | None:
+        image: QtGui.QImage | None = await decoder.load(key)
+        if image is not None:
+            return image
+        return await decoder.load(key, await fetch_attachment(attachment))
+
+    def on_image_decoded(self, placeholder: QtWidgets.QLabel,
+                         loader: Callable[[str], Awaitable[QtGui.QImage | None]],
+                         future: asyncio.Future[DecodedImage]):
+        if future.cancelled() or sip.isdeleted(self) or sip.isdeleted(placeholder):
+            return
+        if future in self._decode_futures:
+            self._decode_futures.remove(future)
+        if self.images_layout.indexOf(placeholder) < 0:
+            return
+        if future.exception():
+            logger.error(future.exception())
+            placeholder.setText('Broken image')
+            return
+        decoded: DecodedImage = future.result()
+        image_box = Screenshot(None, False, decoded.thumbnail,
+                               partial(loader, decoded.key))
+        self.images_layout.replaceWidget(placeholder, image_box)
+        placeholder.deleteLater()
+
+    @staticmethod
+    def cancel_decoding(futures: list[asyncio.Future[DecodedImage]]):
+        for future in futures:
+            future.cancel()
+
+    def set_issue_type_style(self, issue_type: str):
+        color, background = issue_type_colors.get(issue_type,
+                                                  issue_type_colors['Task'])
         self.issue_type.styleDict['default']['color'] = color
         self.issue_type.styleDict['default']['background-color'] = background
         self.issue_type.styleDict['hover']['color'] = color
@@ -77,13 +188,13 @@ class ContentWidget(QtWidgets.QWidget):
     def on_fold(self):
         state = self.text_browser.isHidden()
         if state:
+            self.load_details()
             self.text_browser.show()
-            if self._images:
+            if self.has_images:
                 self.scroll_area.show()
         else:
             self.text_browser.hide()
-            if self._images:
-                self.scroll_area.hide()
+            self.scroll_area.hide()
 
 
     def issue_clicked(self):
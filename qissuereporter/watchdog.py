@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import NamedTuple
+
+
+class StallProfile(NamedTuple):
+    started: float
+    duration: float
+    samples: int
+    stacks: Counter[str]
+
+    def collapsed(self) -> str:
+        started: str = datetime.fromtimestamp(self.started, UTC).isoformat(' ', 'seconds')
+        lines: list[str] = [f'# stall at {started}, {self.duration:.2f} s, '
+                            f'{self.samples} samples']
+        lines.extend(f'{stack} {count}' for stack, count in self.stacks.most_common())
+        return '\n'.join(lines)
+
+
+def collapse_stack(frame: FrameType | None, thread_name: str) -> str:
+    names: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_qualname} ({Path(code.co_filename).name}:{frame.f_lineno})')
+        frame = frame.f_back
+    names.append(thread_name)
+    return ';'.join(reversed(names))
+
+
+def compress_profiles(profiles: list[StallProfile]) -> str:
+    text: str = '\n'.join(profile.collapsed() for profile in profiles)
+    return base64.b64encode(zlib.compress(text.encode(), 9)).decode()
+
+
+def fit_profiles(profiles: list[StallProfile], max_bytes: int) -> str:
+    profiles = sorted(profiles, key=lambda profile: profile.started)
+    while profiles:
+        data: str = compress_profiles(profiles)
+        if len(data) <= max_bytes:
+            return data
+        if len(profiles) > 1:
+            profiles.pop(0)
+            continue
+        profile: StallProfile = profiles[0]
+        if len(profile.stacks) <= 1:
+            break
+        stacks: Counter[str] = Counter(dict(profile.stacks.most_common(
+            len(profile.stacks) // 2)))
+        profiles[0] = profile._replace(stacks=stacks)
+    return ''
+
+
+def decompress_profiles(data: str) -> str:
+    return zlib.decompress(base64.b64decode(data)).decode()
+
+
+class StallWatchdog:
+    def __init__(self, threshold: float = 0.5, heartbeat: float = 0.1,
+                 sample_interval: float = 0.01, capacity: int = 10,
+                 max_stacks: int = 200) -> None:
+        self.threshold: float = threshold
+        self.heartbeat: float = heartbeat
+        self.sample_interval: float = sample_interval
+        self.max_stacks: int = max_stacks
+        self.profiles: deque[StallProfile] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._last_beat: float = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        if self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_event_loop()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._monitor, name='stall-watchdog',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        if self._loop is not None and not self._stop.is_set():
+            self._handle = self._loop.call_later(self.heartbeat, self._beat)
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.threshold / 4):
+            beat: float = self._last_beat
+            lag: float = time.monotonic() - beat - self.heartbeat
+            if lag < self.threshold:
+                continue
+            started: float = time.time() - lag
+            stacks: Counter[str] = Counter()
+            samples: int = 0
+            while self._last_beat == beat and not self._stop.is_set():
+                self._sample(stacks)
+                samples += 1
+                time.sleep(self.sample_interval)
+            duration: float = time.monotonic() - beat - self.heartbeat
+            if len(stacks) > self.max_stacks:
+                stacks = Counter(dict(stacks.most_common(self.max_stacks)))
+            with self._lock:
+                self.profiles.append(StallProfile(started, duration, samples, stacks))
+
+    def _sample(self, stacks: Counter[str]) -> None:
+        names: dict[int, str] = {thread.ident: thread.name
+                                 for thread in threading.enumerate()
+                                 if thread.ident is not None}
+        current: int = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == current:
+                continue
+            stacks[collapse_stack(frame, names.get(ident, str(ident)))] += 1
+
+    def recent(self, window: float | None = None) -> list[StallProfile]:
+        with self._lock:
+            profiles: list[StallProfile] = list(self.profiles)
+        if window is None:
+            return profiles
+        since: float = time.time() - window
+        return [profile for profile in profiles if profile.started >= since]
+
+    def export(self, window: float | None = 3600.0, max_bytes: int | None = None) -> str:
+        profiles: list[StallProfile] = self.recent(window)
+        if not profiles:
+            return ''
+        if max_bytes is None:
+            return compress_profiles(profiles)
+        return fit_profiles(profiles, max_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.profiles.clear()